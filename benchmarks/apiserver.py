@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Local stand-in for the Unpaywall- and CrossRef-APIs, used to test and
+# benchmark the network parts of the script offline.
+# GET /v2/<DOI>     answers like Unpaywall
+# GET /works/<DOI>  answers like CrossRef
+# The answer for a DOI is always the same (it is derived from a hash of the
+# DOI). Latency, errors and throttling can be configured.
+#
+# Usage:
+#   python benchmarks/apiserver.py --port 8080 --latency 0.05 --rate 50
+# and set oaDOIBaseURL = 'http://localhost:8080/v2/' and
+# crBaseURL = 'http://localhost:8080/works/' in section 1 of main.py.
+
+import argparse
+import collections
+import hashlib
+import http.server
+import json
+import random
+import threading
+import time
+import urllib.parse
+
+
+# Return a number between 0 and 1 derived from a DOI (and a salt), so that
+# the same DOI always gets the same answer
+def doiHash(doi, salt=''):
+    digest = hashlib.sha1((salt + doi.lower()).encode('utf-8')).digest()
+    return int.from_bytes(digest[0:8], 'big') / 2. ** 64
+
+
+# Return an Unpaywall-answer for a DOI
+def unpaywallData(doi):
+    h = doiHash(doi, 'unpaywall')
+    isOA = h < 0.45
+    journalIsOA = h < 0.1
+    if not isOA:
+        location = None
+    elif h < 0.3:
+        location = {'host_type': 'publisher',
+                    'license': 'cc-by' if h < 0.25 else None,
+                    'url': 'https://example.org/article/' + doi}
+    else:
+        location = {'host_type': 'repository', 'license': None,
+                    'url': 'https://repository.example.org/' + doi}
+    return {'doi': doi.lower(),
+            'is_oa': isOA,
+            'journal_is_oa': journalIsOA,
+            'oa_status': 'gold' if journalIsOA else
+                         ('closed' if not isOA else 'bronze'),
+            'publisher': 'Publisher ' + str(int(h * 300)),
+            'best_oa_location': location}
+
+
+# Return a CrossRef-answer for a DOI. Some works have no ISSN.
+def crossrefData(doi):
+    h = doiHash(doi, 'crossref')
+    message = {'DOI': doi.lower(),
+               'type': 'journal-article',
+               'publisher': 'Publisher ' + str(int(h * 300)),
+               'container-title': ['Journal ' + str(int(h * 5000))]}
+    if h < 0.8:
+        issn = '%04d-%04d' % (int(h * 10000), int(h * 100000000) % 10000)
+        message['ISSN'] = [issn]
+        if h < 0.4:
+            message['ISSN'].append('%04d-%04d' % (int(h * 20000) % 10000,
+                                                  int(h * 1e9) % 10000))
+    return {'status': 'ok', 'message-type': 'work', 'message': message}
+
+
+# Set up class of the HTTP server. Settings:
+# latency: mean time (seconds) needed for an answer
+# jitter: answers take latency +- jitter * latency seconds
+# notFound: share of DOIs that are unknown (always answered with 404)
+# tooMany: share of requests randomly answered with 429
+# serverError: share of requests randomly answered with 500
+# rate: maximum number of requests per second; further requests are answered
+#       with 429 and 'Retry-After: 1' (0/None = no limit)
+class ApiServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0., jitter=0.5, notFound=0.,
+                 tooMany=0., serverError=0., rate=None, seed=1):
+        super().__init__(address, ApiHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.notFound = notFound
+        self.tooMany = tooMany
+        self.serverError = serverError
+        self.rate = rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.recent = collections.deque()
+        self.counts = collections.Counter()
+
+    # Decide how to answer a request
+    # OUTPUT: HTTP status code
+    def status(self, doi):
+        with self.lock:
+            self.counts['requests'] += 1
+            now = time.monotonic()
+            if self.rate:
+                while self.recent and now - self.recent[0] >= 1.:
+                    self.recent.popleft()
+                if len(self.recent) >= self.rate:
+                    self.counts['throttled'] += 1
+                    return 429
+                self.recent.append(now)
+            r = self.random.random()
+        if r < self.tooMany:
+            code = 429
+        elif r < self.tooMany + self.serverError:
+            code = 500
+        elif doiHash(doi, 'notfound') < self.notFound:
+            code = 404
+        else:
+            code = 200
+        with self.lock:
+            self.counts[code] += 1
+        return code
+
+    def delay(self):
+        if self.latency > 0:
+            with self.lock:
+                r = self.random.uniform(-1., 1.)
+            time.sleep(max(0., self.latency * (1. + self.jitter * r)))
+
+
+class ApiHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path = urllib.parse.urlsplit(self.path).path
+        if path.startswith('/v2/'):
+            answer = unpaywallData
+            doi = urllib.parse.unquote(path[len('/v2/'):])
+        elif path.startswith('/works/'):
+            answer = crossrefData
+            doi = urllib.parse.unquote(path[len('/works/'):])
+        else:
+            self.reply(404, {'error': 'unknown path'})
+            return
+        self.server.delay()
+        code = self.server.status(doi)
+        if code == 200:
+            self.reply(200, answer(doi))
+        elif code == 429:
+            self.reply(429, {'error': 'too many requests'},
+                       {'Retry-After': '1'})
+        elif code == 404:
+            self.reply(404, {'error': 'unknown DOI'})
+        else:
+            self.reply(code, {'error': 'internal server error'})
+
+    def reply(self, code, data, headers=None):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Start an ApiServer in a background thread
+# INPUT: (port (0 = any free port), settings of ApiServer)
+# OUTPUT: ApiServer (base address: 'http://127.0.0.1:<server.server_port>')
+def startServer(port=0, **settings):
+    server = ApiServer(('127.0.0.1', port), **settings)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Local stand-in for the Unpaywall- and CrossRef-APIs')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='mean seconds per answer (default 0.05)')
+    parser.add_argument('--jitter', type=float, default=0.5)
+    parser.add_argument('--not-found', type=float, default=0.05,
+                        help='share of unknown DOIs (404)')
+    parser.add_argument('--too-many', type=float, default=0.,
+                        help='share of requests answered with 429')
+    parser.add_argument('--server-error', type=float, default=0.,
+                        help='share of requests answered with 500')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='maximum number of requests per second')
+    args = parser.parse_args()
+    server = ApiServer(('127.0.0.1', args.port), latency=args.latency,
+                       jitter=args.jitter, notFound=args.not_found,
+                       tooMany=args.too_many, serverError=args.server_error,
+                       rate=args.rate)
+    print('Serving on http://127.0.0.1:%d (Unpaywall: /v2/, CrossRef: '
+          '/works/)' % args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.server_close()
+    print(dict(server.counts))
+
+
+if __name__ == '__main__':
+    main()
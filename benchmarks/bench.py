@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Benchmark of the offline parts of the script with synthetic data (see
+# synthetic.py): reading in the database files, duplicate check (dubletten),
+# identifying institutions (listCheck), DOAJ matching (checkISSN) and writing
+# the output file.
+#
+# Usage (from the main folder of the repository):
+#   python benchmarks/bench.py --records 100000 --duplicates 0.2
+# The results are printed as a table and saved as a JSON report (see
+# runreport.py).
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+startDir = os.getcwd()
+sys.path.insert(0, repoDir)
+# readers.py reads in RIS-fields.csv from the working directory
+os.chdir(repoDir)
+
+from prettytable import PrettyTable
+
+from dedup import dubletten, removeDoubles
+from doaj import checkISSN, loadDoajIndex
+from documents import Database, save_publications_data_to_file
+from matching import InstitutionMatcher, institutionNames
+from readers import readDatabases
+from runreport import RunReport
+from synthetic import generate
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the script with synthetic data')
+    parser.add_argument('--records', type=int, default=10000,
+                        help='number of distinct publications (default 10000)')
+    parser.add_argument('--duplicates', type=float, default=0.2,
+                        help='share of publications found more than once '
+                             '(default 0.2)')
+    parser.add_argument('--doaj', type=int, default=17000,
+                        help='number of journals in the DOAJ (default 17000)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='processes for reading in the files')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--dir', default=None,
+                        help='directory for the generated files (default: '
+                             'temporary directory, removed afterwards)')
+    parser.add_argument('--compression', choices=['gzip', 'zstd'],
+                        default=None,
+                        help='compression of allPubs.txt (see '
+                             'outputCompression in main.py)')
+    parser.add_argument('--report', default='benchmark-report.json',
+                        help='file name of the JSON report')
+    args = parser.parse_args()
+
+    if args.dir is not None:
+        workDir = os.path.join(startDir, args.dir)
+    else:
+        workDir = tempfile.mkdtemp(prefix='oa-eval-bench-')
+    try:
+        start = time.perf_counter()
+        inputFiles, doajFile = generate(workDir, args.records, args.duplicates,
+                                        args.seed, args.doaj)
+        print('Generated synthetic data in %.1f s' %
+              (time.perf_counter() - start))
+
+        report = RunReport(records=args.records, duplicates=args.duplicates,
+                           doajJournals=args.doaj, workers=args.workers,
+                           seed=args.seed, compression=args.compression)
+
+        report.begin('ingest')
+        dbs = [(Database(name, ind), fileFormat, fileName)
+               for name, ind, fileFormat, fileName in inputFiles]
+        readDatabases(dbs, args.workers, None, report)
+        for db, fileFormat, fileName in dbs:
+            for doc in db.content:
+                if doc.DOI is not None:
+                    doc.DOI = doc.DOI.lower()
+        report.end(records=sum(len(db.content) for db, f, n in dbs))
+
+        report.begin('dubletten')
+        finalList = dubletten([db for db, fileFormat, fileName in dbs])
+        finalList, doubles = removeDoubles(finalList)
+        report.end(records=len(finalList), doublesWithinDatabases=len(doubles))
+
+        report.begin('listCheck')
+        matchers = [
+            InstitutionMatcher([(name, var) for name, var, var1
+                                in institutionNames]),
+            InstitutionMatcher([(name, var1 or var) for name, var, var1
+                                in institutionNames])]
+        found = 0
+        for item in finalList:
+            if item.corrAuth not in [None, '']:
+                i, j = matchers[0].match(item.corrAuth)
+                if i:
+                    item.nameVariant = j
+                    found += 1
+            if item.affiliations not in [None, '']:
+                k, l = matchers[1].match(item.affiliations)
+                if k:
+                    item.allNameVariants = l
+        report.end(records=len(finalList), corrAuthFound=found)
+
+        report.begin('DOAJ index')
+        doajIndex = loadDoajIndex(doajFile)
+        report.end(journals=len(doajIndex))
+
+        report.begin('checkISSN')
+        for item in finalList:
+            if item.ISSN == '':
+                item.ISSN = None
+            if item.eISSN == '':
+                item.eISSN = None
+        checkISSN(finalList, doajIndex)
+        report.end(records=len(finalList),
+                   gold=len([x for x in finalList if x.oaStatus == 'gold']))
+
+        report.begin('output')
+        save_publications_data_to_file(
+            finalList, os.path.join(workDir, 'allPubs.txt'),
+            args.compression)
+        report.end(records=len(finalList))
+    finally:
+        if args.dir is None:
+            shutil.rmtree(workDir)
+
+    table = PrettyTable(['Stage', 'Wall time (s)', 'CPU time (s)',
+                         'RSS growth (MB)', 'Process peak RSS (MB)',
+                         'Counts'])
+    for stage in report.stages:
+        table.add_row([stage['stage'], stage['wallTime'], stage['cpuTime'],
+                       stage['rssGrowth'], stage['processPeakRSS'],
+                       ', '.join('%s=%s' % x for x in stage['counts'].items())])
+    print(table)
+    report.write(os.path.join(startDir, args.report))
+    print('Report saved to ' + args.report)
+
+
+if __name__ == '__main__':
+    main()
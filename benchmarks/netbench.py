@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Benchmark of contacting Unpaywall and CrossRef against the local stand-in
+# server (see apiserver.py). The DOIs are requested the same way as in
+# askOaDOI and askCR of main.py (webapi.ApiClient with retries and rate
+# limit) for several numbers of parallel requests. Throughput and latency
+# per DOI (including repetitions after errors) are reported.
+#
+# Usage (from the main folder of the repository):
+#   python benchmarks/netbench.py --dois 2000 --workers 1,4,8,16 \
+#       --latency 0.05 --server-rate 100
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+
+repoDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, repoDir)
+
+from prettytable import PrettyTable
+
+from apiserver import startServer
+from webapi import ApiClient
+
+
+# ApiClient that records the time needed for every URL (including all
+# repetitions)
+class TimedClient(ApiClient):
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        self.latencies = []
+        self.lock = threading.Lock()
+
+    def getJSON(self, url):
+        start = time.perf_counter()
+        try:
+            return super().getJSON(url)
+        finally:
+            with self.lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+# Return the value below which the given share of the sorted values lies
+def percentile(values, share):
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+# Request all DOIs from one API and measure the run
+# INPUT: (name of the API, list of URLs, ApiServer, settings of the ApiClient)
+# OUTPUT: dictionary with the results
+def run(api, urls, server, **settings):
+    client = TimedClient(**settings)
+    with server.lock:
+        server.counts.clear()
+    results = {'ok': 0, 'notFound': 0, 'failed': 0}
+    start = time.perf_counter()
+    for data, err in client.fetchAll(urls):
+        if err is None:
+            results['ok'] += 1
+        elif isinstance(err, urllib.error.HTTPError) and err.code == 404:
+            results['notFound'] += 1
+        else:
+            results['failed'] += 1
+    seconds = time.perf_counter() - start
+    latencies = sorted(client.latencies)
+    results.update({
+        'api': api,
+        'workers': settings['workers'],
+        'rate': settings['rate'],
+        'dois': len(urls),
+        'seconds': round(seconds, 3),
+        'doisPerSecond': round(len(urls) / seconds, 1),
+        'p50': round(1000 * percentile(latencies, 0.5), 1),
+        'p90': round(1000 * percentile(latencies, 0.9), 1),
+        'p99': round(1000 * percentile(latencies, 0.99), 1),
+        'max': round(1000 * latencies[-1], 1),
+        'requests': server.counts['requests'],
+        'throttled': server.counts['throttled']
+    })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark contacting Unpaywall and CrossRef against a '
+                    'local stand-in server')
+    parser.add_argument('--dois', type=int, default=1000,
+                        help='number of DOIs per run (default 1000)')
+    parser.add_argument('--workers', default='1,4,8,16',
+                        help='numbers of parallel requests to compare')
+    parser.add_argument('--rate', type=float, default=None,
+                        help='client-side limit of requests per second')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--backoff', type=float, default=0.1,
+                        help='seconds before the first repetition')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='mean seconds per answer of the server')
+    parser.add_argument('--not-found', type=float, default=0.05)
+    parser.add_argument('--too-many', type=float, default=0.01)
+    parser.add_argument('--server-error', type=float, default=0.01)
+    parser.add_argument('--server-rate', type=float, default=None,
+                        help='requests per second accepted by the server')
+    parser.add_argument('--api', choices=['unpaywall', 'crossref', 'both'],
+                        default='both')
+    parser.add_argument('--report', default='netbench-report.json',
+                        help='file name of the JSON report')
+    args = parser.parse_args()
+
+    server = startServer(latency=args.latency, notFound=args.not_found,
+                         tooMany=args.too_many, serverError=args.server_error,
+                         rate=args.server_rate)
+    base = 'http://127.0.0.1:%d' % server.server_port
+    dois = ['10.%d/bench.%d' % (1000 + i % 900, i) for i in range(args.dois)]
+    urlLists = []
+    if args.api in ('unpaywall', 'both'):
+        urlLists.append(('unpaywall', [base + '/v2/' + doi +
+                                       '?email=test@example.com'
+                                       for doi in dois]))
+    if args.api in ('crossref', 'both'):
+        urlLists.append(('crossref', [base + '/works/' + doi
+                                      for doi in dois]))
+
+    results = []
+    for workers in [int(x) for x in args.workers.split(',')]:
+        for api, urls in urlLists:
+            results.append(run(api, urls, server, workers=workers,
+                               rate=args.rate, retries=args.retries,
+                               backoff=args.backoff, timeout=30))
+    server.shutdown()
+    server.server_close()
+
+    table = PrettyTable(['API', 'Workers', 'DOIs/s', 'p50 ms', 'p90 ms',
+                         'p99 ms', 'max ms', 'OK', '404', 'Failed',
+                         'Requests', 'Throttled'])
+    for r in results:
+        table.add_row([r['api'], r['workers'], r['doisPerSecond'], r['p50'],
+                       r['p90'], r['p99'], r['max'], r['ok'], r['notFound'],
+                       r['failed'], r['requests'], r['throttled']])
+    print(table)
+    settings = {k: v for k, v in vars(args).items() if k != 'report'}
+    with open(args.report, 'w', encoding='utf-8') as f:
+        json.dump({'settings': settings, 'runs': results}, f, indent=1)
+    print('Report saved to ' + args.report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Generate synthetic database exports and a synthetic DOAJ export in the
+# formats read in by readers.py, so that the script can be benchmarked
+# without licensed data. The contents are random; only the structure of the
+# files (columns, RIS-tags and the special cases of some databases) follows
+# the real exports.
+
+import os
+import random
+
+# Databases as set up in section 4 of main.py: (name, database ID, format,
+# file name)
+databases = [
+    ('Web of Science', 1, 'wosTab', 'wos.txt'),
+    ('SciFinder', 2, 'sciFinder', 'sf.txt'),
+    ('PubMed', 3, 'pubmed', 'pubmed.txt'),
+    ('Scopus', 16, 'ris', 'scopus.ris'),
+    ('Inspec', 5, 'inspec', 'inspec.txt'),
+    ('TEMA', 4, 'ris', 'tema.ris'),
+    ('ProQuest', 7, 'ris', 'pq.ris'),
+    ('Business Source Complete', 9, 'ris', 'bsc.ris'),
+    ('GeoRef', 10, 'ris', 'gf.ris'),
+    ('CINAHL', 12, 'ris', 'cinahl.ris'),
+    ('LISA', 15, 'ris', 'lisa.ris'),
+    ('CAB Abstracts', 11, 'ris', 'cab.ris'),
+    ('Embase', 14, 'ris', 'embase.ris'),
+    ('SportDiscus', 17, 'ris', 'sd.ris'),
+    ('IEEE', 6, 'ris', 'ieee.ris'),
+    ('EBSCO', 13, 'ris', 'ebsco.ris')
+]
+
+# Share of the publications that are found in each database (the large
+# databases come first)
+dbWeights = [30, 6, 10, 30, 6, 2, 2, 1, 1, 1, 1, 1, 4, 1, 3, 1]
+
+# Affiliations of the authors. About a third belong to one of the
+# institutions in matching.institutionNames.
+affiliations = [
+    'Tech Univ Berlin, Inst Math, Berlin, Germany',
+    'Technische Universität Berlin, Fachgebiet Bauinformatik, Berlin',
+    'Charite Univ Med Berlin, Dept Cardiol, Berlin, Germany',
+    'Free Univ Berlin, Dept Phys, Berlin, Germany',
+    'Humboldt Univ, Inst Biol, Berlin, Germany',
+    'Beuth Hsch Tech Berlin, Germany',
+    'Univ Oxford, Dept Engn Sci, Oxford, England',
+    'MIT, Dept Chem, Cambridge, MA USA',
+    'Max Planck Inst Colloids & Interfaces, Potsdam, Germany',
+    'Univ Tokyo, Grad Sch Engn, Tokyo, Japan',
+    'ETH, Inst Theoret Phys, Zurich, Switzerland',
+    'Univ Munich, Dept Stat, Munich, Germany',
+    'CNRS, Lab Phys, Paris, France',
+    'Univ Sao Paulo, Inst Quim, Sao Paulo, Brazil',
+    'Peking Univ, Sch Phys, Beijing, Peoples R China',
+    'Univ Toronto, Dept Comp Sci, Toronto, ON, Canada',
+    'Stanford Univ, Dept Mech Engn, Stanford, CA USA'
+]
+
+
+# Set up class for generating random publications and journals. All values
+# are derived from one random generator, so the same seed yields the same
+# files.
+class Generator(object):
+    def __init__(self, seed=1, journals=2000):
+        self.random = random.Random(seed)
+        syllables = [c + v for c in 'bcdfghklmnprstvwz' for v in 'aeiou']
+        self.words = sorted(set(
+            ''.join(self.random.choice(syllables)
+                    for i in range(self.random.randint(2, 4)))
+            for j in range(5000)))
+        self.journals = [('Journal of ' + self.title(3),
+                          self.issn(), self.issn(),
+                          'Publisher ' + str(self.random.randint(1, 300)))
+                         for i in range(journals)]
+
+    def title(self, n):
+        return ' '.join(self.random.choice(self.words)
+                        for i in range(n)).capitalize()
+
+    def author(self):
+        return (self.random.choice(self.words).capitalize() + ', ' +
+                self.random.choice('ABCDEFGHIJKLMNOPRSTUVW'))
+
+    # Return a random ISSN with a valid check digit
+    def issn(self):
+        digits = [self.random.randint(0, 9) for i in range(7)]
+        check = -sum(d * (8 - i) for i, d in enumerate(digits)) % 11
+        digits = ''.join(str(d) for d in digits) + \
+                 ('X' if check == 10 else str(check))
+        return digits[0:4] + '-' + digits[4:8]
+
+    # Return a random publication (dictionary)
+    # INPUT: number of the publication (used to make the DOI unique)
+    def publication(self, i):
+        journal = self.random.choice(self.journals)
+        authors = [self.author() for a in range(self.random.randint(1, 8))]
+        return {
+            'title': self.title(self.random.randint(6, 14)),
+            'authors': authors,
+            'affiliations': [self.random.choice(affiliations)
+                             for a in authors],
+            'DOI': '10.%d/synth.%d' % (1000 + i % 900, i)
+                   if self.random.random() < 0.85 else '',
+            'journal': journal[0],
+            'ISSN': journal[1] if self.random.random() < 0.9 else '',
+            'eISSN': journal[2] if self.random.random() < 0.5 else '',
+            'publisher': journal[3],
+            'year': str(self.random.choice([2018, 2019, 2019, 2019, 2020])),
+            'eMail': 'author%d@example.org' % i
+        }
+
+
+# Write publications in tab-delimited Web of Science-format
+def writeWosTab(fileName, pubs):
+    with open(fileName, 'w') as f:
+        f.write('\t'.join('Field%d' % k for k in range(68)) + '\n')
+        for p in pubs:
+            r = [''] * 68
+            r[1] = '; '.join(p['authors'])
+            r[8] = p['title']
+            r[54] = p['DOI']
+            r[9] = p['journal'].upper()
+            r[38] = p['ISSN']
+            r[39] = p['eISSN']
+            r[35] = p['publisher'].upper()
+            r[44] = p['year']
+            r[22] = '; '.join('[' + a + '] ' + aff for a, aff
+                              in zip(p['authors'], p['affiliations']))
+            r[23] = p['authors'][0] + ' (reprint author), ' + \
+                    p['affiliations'][0]
+            r[24] = p['eMail']
+            r[59] = 'Physics'
+            r[27] = 'Deutsche Forschungsgemeinschaft'
+            f.write('\t'.join(r) + '\n')
+
+
+# Write publications in tab-delimited SciFinder-format
+def writeSciFinder(fileName, pubs):
+    with open(fileName, 'w') as f:
+        f.write('\t'.join('"Field%d"' % k for k in range(52)) + '\n')
+        for p in pubs:
+            r = [''] * 52
+            r[6] = '; '.join(p['authors'])
+            r[3] = p['title']
+            r[49] = p['DOI']
+            r[17] = p['journal']
+            r[15] = p['ISSN']
+            r[22] = p['year']
+            r[11] = p['affiliations'][0]
+            r[9] = 'Chemistry'
+            f.write('\t'.join('"' + x + '"' for x in r) + '\n')
+
+
+# Write publications in tab-delimited Inspec-format
+def writeInspec(fileName, pubs):
+    with open(fileName, 'w') as f:
+        f.write('\t'.join('Field%d' % k for k in range(56)) + '\n')
+        for p in pubs:
+            r = [''] * 56
+            r[6] = '; '.join(p['authors'])
+            r[5] = p['title']
+            r[51] = p['DOI']
+            r[12] = p['journal']
+            r[50] = p['ISSN']
+            r[41] = p['publisher']
+            r[13] = p['year']
+            r[35] = '; '.join(p['authors'][0:1] + p['affiliations'][0:1] +
+                              p['affiliations'][1:])
+            f.write('\t'.join(r) + '\n')
+
+
+# Write publications in PubMed-format (MEDLINE)
+def writePubmed(fileName, pubs):
+    with open(fileName, 'w') as f:
+        for k, p in enumerate(pubs):
+            f.write('PMID- %d\n' % (30000000 + k))
+            if p['ISSN']:
+                f.write('IS  - %s (Linking)\n' % p['ISSN'])
+            if p['eISSN']:
+                f.write('IS  - %s (Electronic)\n' % p['eISSN'])
+            # long titles are continued on the next line
+            f.write('TI  - %s\n' % p['title'][:60])
+            if p['title'][60:]:
+                f.write('      %s\n' % p['title'][60:])
+            for au, aff in zip(p['authors'], p['affiliations']):
+                f.write('FAU - %s\n' % au)
+                f.write('AD  - %s\n' % aff)
+            f.write('JT  - %s\n' % p['journal'])
+            f.write('DP  - %s Mar 12\n' % p['year'])
+            if p['DOI']:
+                f.write('LID - %s [doi]\n' % p['DOI'])
+            f.write('\n')
+
+
+# Read the first RIS-tag of every document-attribute for a database from
+# RIS-fields.csv
+# INPUT: (file name of RIS-fields.csv, database ID)
+# OUTPUT: dictionary {attribute: RIS-tag}
+def risTags(risFieldsFile, ind):
+    with open(risFieldsFile, encoding='utf-8') as f:
+        rows = [line.rstrip('\n').split(';') for line in f]
+    col = rows[0].index(str(ind))
+    tags = {}
+    for row in rows[1:]:
+        if row[col] and row[0] not in tags:
+            tags[row[0]] = row[col]
+    return tags
+
+
+# Write publications in RIS-format, using the RIS-tags of the database and
+# the special cases handled in readers.risDocuments (affiliations, DOI and
+# e-mail in the notes field, corresponding author of Scopus and Embase,
+# records of CINAHL starting with 'ID')
+def writeRis(fileName, pubs, ind, risFieldsFile):
+    tags = risTags(risFieldsFile, ind)
+    with open(fileName, 'w') as f:
+        for k, p in enumerate(pubs):
+            f.write('TY  - JOUR\n')
+            if ind == 12:
+                f.write('ID  - %d\n' % k)
+            for au in p['authors']:
+                f.write('%s  - %s\n' % (tags['authors'], au))
+            f.write('%s  - %s.\n' % (tags['title'], p['title']))
+            f.write('%s  - %s\n' % (tags['journal'], p['journal']))
+            if p['ISSN']:
+                f.write('SN  - %s\n' % p['ISSN'])
+            if p['eISSN']:
+                f.write('SN  - %s\n' % p['eISSN'])
+            f.write('%s  - %s/03/12/\n' % (tags['year'], p['year']))
+            if ind in (9, 13, 17):
+                if ind == 17:
+                    affs = '; : '.join('%d %s' % (n + 1, aff) for n, aff
+                                       in enumerate(p['affiliations']))
+                else:
+                    affs = '; '.join('%d: %s' % (n + 1, aff) for n, aff
+                                     in enumerate(p['affiliations']))
+                f.write('N1  - Accession Number: %d; Affiliations: %s Source '
+                        'Info: Vol. 12 Issue 3, p1; Email Address: %s; '
+                        'DOI: %s.\n' % (k, affs, p['eMail'], p['DOI']))
+            elif 'affiliations' in tags:
+                for aff in p['affiliations']:
+                    f.write('%s  - %s\n' % (tags['affiliations'], aff))
+            if ind == 16:
+                f.write('N1  - Correspondence Address: %s, %s; email: %s\n'
+                        % (p['authors'][0], p['affiliations'][0], p['eMail']))
+            if ind == 14:
+                f.write('M1  - %s, %s; E-mail: %s\n'
+                        % (p['authors'][0], p['affiliations'][0], p['eMail']))
+            if p['DOI'] and ind == 13:
+                f.write('L3  - %s\n' % p['DOI'])
+            elif p['DOI'] and 'DOI' in tags:
+                f.write('%s  - https://doi.org/%s\n' % (tags['DOI'], p['DOI']))
+            if 'publisher' in tags:
+                f.write('%s  - %s\n' % (tags['publisher'], p['publisher']))
+            f.write('ER  - \n\n')
+
+
+# Write a DOAJ export ('doaj.txt') containing some of the journals of the
+# publications and additional journals
+# INPUT: (file name, Generator, number of journals in the DOAJ)
+def writeDoaj(fileName, gen, doajJournals):
+    journals = gen.journals[0:len(gen.journals) // 3]
+    while len(journals) < doajJournals:
+        journals.append(('Open ' + gen.title(3), gen.issn(), gen.issn(),
+                         'Publisher ' + str(gen.random.randint(1, 300))))
+    with open(fileName, 'w', encoding='utf-8') as f:
+        f.write('\t'.join('Column %d' % k for k in range(60)) + '\n')
+        for title, issn, eissn, publisher in journals[0:doajJournals]:
+            r = [''] * 60
+            r[0] = title
+            r[3] = issn if gen.random.random() < 0.7 else ''
+            r[4] = eissn
+            r[5] = publisher
+            if gen.random.random() < 0.4:
+                r[11] = str(gen.random.randint(5, 40) * 100)
+                r[12] = gen.random.choice(['EUR', 'USD', 'GBP'])
+            r[27] = str(gen.random.randint(1995, 2019))
+            r[42] = gen.random.choice(['CC BY', 'CC BY-NC', 'CC BY-NC-ND'])
+            r[54] = 'Science: Physics'
+            f.write('\t'.join(r) + '\n')
+
+
+writers = {
+    'wosTab': writeWosTab,
+    'sciFinder': writeSciFinder,
+    'inspec': writeInspec,
+    'pubmed': writePubmed
+}
+
+
+# Generate the input files of all databases and the DOAJ export
+# INPUT: (directory, number of publications, share of publications that are
+#         duplicates (found in a second database or twice in the same one),
+#         seed, number of journals in the DOAJ, path of RIS-fields.csv)
+# OUTPUT: (list of (name, database ID, format, file name), file name of the
+#          DOAJ export)
+def generate(outDir, records, duplicates=0.2, seed=1, doajJournals=17000,
+             risFieldsFile='RIS-fields.csv'):
+    gen = Generator(seed, journals=max(100, records // 50))
+    contents = [[] for db in databases]
+    for i in range(records):
+        pub = gen.publication(i)
+        k = gen.random.choices(range(len(databases)), dbWeights)[0]
+        contents[k].append(pub)
+        if gen.random.random() < duplicates:
+            # one in ten duplicates is found twice in the same database
+            if gen.random.random() < 0.1:
+                contents[k].append(pub)
+            else:
+                other = gen.random.choices(range(len(databases)), dbWeights)[0]
+                contents[other].append(pub)
+    inputDir = os.path.join(outDir, 'input-files')
+    if not os.path.exists(inputDir):
+        os.makedirs(inputDir)
+    inputFiles = []
+    for (name, ind, fileFormat, fileName), pubs in zip(databases, contents):
+        gen.random.shuffle(pubs)
+        fileName = os.path.join(inputDir, fileName)
+        if fileFormat == 'ris':
+            writeRis(fileName, pubs, ind, risFieldsFile)
+        else:
+            writers[fileFormat](fileName, pubs)
+        inputFiles.append((name, ind, fileFormat, fileName))
+    doajFile = os.path.join(inputDir, 'doaj.txt')
+    writeDoaj(doajFile, gen, doajJournals)
+    return inputFiles, doajFile
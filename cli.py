@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Run the stages of main.py one at a time. Every stage reads the results of
+# the stage before from its snapshot file instead of running it again:
+#   ingest  read in the database files (section 4 of main.py; the contents
+#           are cached in 'readin-cache', see readInCache)
+#   dedup   duplicate check and selection of the years (section 5); reads in
+#           the databases from 'readin-cache', saves 'finalList.snapshot'
+#   enrich  institutions, DOAJ, CrossRef, Unpaywall and manual check
+#           (sections 6 to 10); reads 'finalList.snapshot', saves
+#           'enriched.snapshot'
+#   report  results and statistics (sections 11 and 12); reads only
+#           'enriched.snapshot'
+# All other settings are taken from section 1 of main.py and can be replaced
+# with --set (e.g. --set yearMin=2018 --set contactCR=2).
+#
+# Usage (in the folder containing main.py and 'input-files'):
+#   python cli.py ingest
+#   python cli.py dedup
+#   python cli.py enrich --set contactOaDOI=3
+#   python cli.py report
+#
+# Modules are only imported by the stages that need them, so e.g. 'report'
+# doesn't load the reading-in and API code.
+
+import argparse
+import json
+import os
+import runpy
+
+# Settings of main.py for every stage (see section 1 of main.py)
+stageSettings = {
+    'ingest': {'lastStage': 'ingest'},
+    'dedup': {'lastStage': 'dedup'},
+    'enrich': {'lastStage': 'enrich', 'doReadIn': False}
+}
+
+
+# Turn '--set' arguments into settings. Values are read as JSON if possible
+# (numbers, true/false, null), otherwise as strings.
+# INPUT: list of 'key=value' strings
+# OUTPUT: dictionary
+def parseSettings(items):
+    settings = {}
+    for item in items:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise SystemExit('--set ' + item + ': expected KEY=VALUE')
+        try:
+            settings[key] = json.loads(value)
+        except ValueError:
+            settings[key] = value
+    return settings
+
+
+# Run main.py up to the end of a stage. Settings given via OAEVAL_SETTINGS
+# are kept; the ones of the stage and of --set take precedence.
+# INPUT: (name of the stage, dictionary of settings)
+def runStage(stage, settings):
+    merged = json.loads(os.environ.get('OAEVAL_SETTINGS', '{}'))
+    merged.update(stageSettings[stage])
+    merged.update(settings)
+    os.environ['OAEVAL_SETTINGS'] = json.dumps(merged)
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'main.py')
+    runpy.run_path(script, run_name='__main__')
+
+
+# Create the results and statistics from 'enriched.snapshot'. Of the settings
+# only doAnalysis and outputCompression are used.
+# INPUT: (file name of the snapshot, dictionary of settings)
+def runReport(snapshotFile, settings):
+    from documents import dbNameID
+    from results import writeResults
+    from snapshot import Snapshot
+
+    if not os.path.exists(snapshotFile):
+        raise SystemExit(snapshotFile + ' not found - run '
+                         '"python cli.py enrich" first')
+    snapshot = Snapshot(snapshotFile)
+    finalList = snapshot.documents()
+    meta = snapshot.meta
+    snapshot.close()
+    # JSON keys are strings
+    dbNameID.update({int(k): v for k, v in meta['databases'].items()})
+    writeResults(finalList, meta['institutions'],
+                 settings.get('doAnalysis', True),
+                 settings.get('outputCompression'))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run single stages of the OA analysis (see main.py)')
+    parser.add_argument('stage', choices=['ingest', 'dedup', 'enrich',
+                                          'report'])
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='KEY=VALUE',
+                        help='replace a setting of section 1 of main.py')
+    parser.add_argument('--snapshot', default='enriched.snapshot',
+                        help='snapshot read by "report" (default: '
+                             'enriched.snapshot)')
+    args = parser.parse_args()
+    settings = parseSettings(args.set)
+    if args.stage == 'report':
+        merged = json.loads(os.environ.get('OAEVAL_SETTINGS', '{}'))
+        merged.update(settings)
+        runReport(args.snapshot, merged)
+    else:
+        runStage(args.stage, settings)
+
+
+if __name__ == '__main__':
+    main()
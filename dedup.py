@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+
+# Duplicate check
+# This function takes the data of the first database (= masterList) and
+# compares the data of each following database with it. All duplicates are
+# removed from the new data which is then added to the masterList.
+# Comparisons are done via DOI-matching and then title/author-matching.
+# DOIs and title/author-strings (see Document.konsonanten) of the masterList
+# are kept in sets, so every comparison is a single lookup. The strings are
+# computed only once per document. Duplicates within one database are not
+# removed here (see removeDoubles).
+# INPUT: list of Database-objects in the order in which they are considered
+# OUTPUT: list containing Documents with duplicates removed
+def dubletten(databases):
+    masterList = list(databases[0].content)
+    doiSet = set(x.DOI for x in masterList)
+    konsSet = set(item.konsonanten() for item in masterList)
+    for db in databases[1:]:
+        nowList = db.content
+        i = len(nowList)
+        print(db.name, ' - number of records: ', i)
+        nowList = [item for item in nowList if item.DOI is None
+                                            or item.DOI.strip('"') == ''
+                                            or item.DOI.strip('"') not in doiSet]
+        j = len(nowList)
+        print(db.name, ' - number of records removed via DOI-matching: ', i-j)
+        konsNow = [(item, item.konsonanten()) for item in nowList
+                   if item.authors is not None]
+        konsNow = [(item, key) for item, key in konsNow if key not in konsSet]
+        nowList = [item for item, key in konsNow]
+        k = len(nowList)
+        print(db.name, \
+              ' - number of records removed via title/author-matching: ', j-k)
+        print(db.name, ' - number of records added to masterList: ', k)
+        masterList += nowList
+        doiSet.update(x.DOI for x in nowList)
+        konsSet.update(key for item, key in konsNow)
+    return masterList
+
+
+# Check for duplicates within a database via DOI-matching (documents without
+# a DOI are compared via title/author-matching). The first occurrence of a
+# publication is kept.
+# INPUT: list of Documents
+# OUTPUT: (list of Documents with duplicates removed, list of removed
+#         duplicates as (duplicate, kept Document, 'DOI' | 'title/author'))
+def removeDoubles(docList):
+    seen = {}
+    seen1 = {}
+    uniqueList = []
+    doubles = []
+    for x in docList:
+        if x.DOI != '' and x.DOI is not None:
+            key, keys, reason = x.DOI, seen, 'DOI'
+        else:
+            key, keys, reason = x.konsonanten(), seen1, 'title/author'
+        if key not in keys:
+            keys[key] = x
+            uniqueList.append(x)
+        else:
+            doubles.append((x, keys[key], reason))
+    return uniqueList, doubles
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import collections
+import os
+
+from issn import normalizeISSNs
+from snapshot import Snapshot, fileFingerprint, writeSnapshot
+
+# Data of one DOAJ journal as needed by the script
+DoajJournal = collections.namedtuple('DoajJournal', [
+    'ISSN', 'eISSN', 'title', 'subject', 'APCValue', 'APCCurrency',
+    'publisher', 'lizenz', 'startYear'])
+
+# Columns of the DOAJ export 'doaj.txt' that are read in, in the order of the
+# fields of DoajJournal
+doajColumns = (
+    3,    # Journal ISSN (print version)
+    4,    # Journal EISSN (online version)
+    0,    # Journal title
+    54,   # Subjects
+    11,   # APC amount
+    12,   # Currency
+    5,    # Publisher
+    42,   # Journal license
+    27    # First calendar year journal provided online Open Access content
+)
+
+
+# Turn the values read in from the DOAJ export into a DoajJournal
+# INPUT: list of values in the order of doajColumns
+# OUTPUT: DoajJournal
+def doajJournal(rec):
+    return DoajJournal(
+        rec[0],                                            # ISSN
+        rec[1],                                            # eISSN
+        rec[2],                                            # title
+        rec[3],                                            # subject
+        rec[4],                                            # APC amount
+        rec[5],                                            # currency
+        ''.join([s for s in rec[6].strip() if s != '\n']), # publisher
+        rec[7],                                            # licence
+        int(rec[8]) if rec[8].strip().isdigit() else None  # start year
+    )
+
+
+# Read in the DOAJ export (tab-separated, UTF-8, one header line)
+# INPUT: file name
+# OUTPUT: list of DoajJournals
+def readDoajFile(doajFile):
+    journals = []
+    with open(doajFile, encoding='utf-8') as f:
+        next(f, None)
+        for line in f:
+            line = line.split('$#')[0].rstrip('\r\n')
+            if not line.strip():
+                continue
+            fields = line.split('\t')
+            journals.append(doajJournal([fields[i] for i in doajColumns]))
+    return journals
+
+
+# Load the DoajIndex for a DOAJ export. The journals are saved to a snapshot
+# file (indexFile) the first time; afterwards they are loaded from there as
+# long as the fingerprint of the DOAJ export did not change.
+# INPUT: (file name of the DOAJ export, file name of the snapshot or None)
+# OUTPUT: DoajIndex
+def loadDoajIndex(doajFile, indexFile=None):
+    if indexFile is not None and os.path.exists(indexFile):
+        snapshot = Snapshot(indexFile)
+        source = snapshot.meta.get('source')
+        if source is not None \
+        and fileFingerprint(doajFile, source)['sha1'] == source['sha1']:
+            columns = [snapshot.column(field) for field in DoajJournal._fields]
+            snapshot.close()
+            return DoajIndex([DoajJournal(*rec) for rec in zip(*columns)])
+        snapshot.close()
+    journals = readDoajFile(doajFile)
+    if indexFile is not None:
+        writeSnapshot(journals, indexFile, DoajJournal._fields,
+                      meta={'source': fileFingerprint(doajFile)})
+    return DoajIndex(journals)
+
+
+# Set up class for looking up journals in the DOAJ via their ISSN/eISSN.
+# The index is built once from the journals read in from 'doaj.txt';
+# afterwards every lookup is a dictionary access instead of a scan over all
+# journals. The ISSNs are normalized (see issn.normalizeISSNs), so they match
+# the normalized ISSNs of the Documents.
+class DoajIndex(object):
+    def __init__(self, journals):
+        self.journals = list(journals)
+        self.byISSN = {}
+        self.byEISSN = {}
+        self.byLink = {}
+        self.linking = None
+        for journal, issn, eissn in zip(self.journals, *self.keys()):
+            # If an ISSN is listed more than once only the first journal
+            # counts (same as the former list comprehension over the data)
+            if issn is not None:
+                self.byISSN.setdefault(issn, journal)
+            if eissn is not None:
+                self.byEISSN.setdefault(eissn, journal)
+
+    # Return the normalized ISSNs and eISSNs of all journals. ISSNs that
+    # can't be normalized are kept as they are; empty ones are None.
+    def keys(self):
+        columns = []
+        for field in ('ISSN', 'eISSN'):
+            values = [getattr(journal, field) for journal in self.journals]
+            columns.append([new if new is not None else (old or None)
+                            for old, new in zip(values,
+                                                normalizeISSNs(values))])
+        return columns
+
+    # Add the linking ISSNs (ISSN-L) of the journals. Afterwards ISSNs that
+    # are not listed in the DOAJ are also matched via their ISSN-L (e.g. the
+    # print ISSN of a journal for which the DOAJ only lists the eISSN).
+    # INPUT: IssnLinking (see issn.py)
+    def setLinking(self, linking):
+        self.linking = linking
+        self.byLink = {}
+        issns, eissns = self.keys()
+        links = linking.linkAll(issns)
+        eLinks = linking.linkAll(eissns)
+        for journal, link, eLink in zip(self.journals, links, eLinks):
+            for key in (link, eLink):
+                if key is not None:
+                    self.byLink.setdefault(key, journal)
+
+    def __len__(self):
+        return len(self.journals)
+
+    def __contains__(self, issn):
+        return issn in self.byISSN or issn in self.byEISSN
+
+    # Return the journal for an ISSN or eISSN. Matches in the print ISSN
+    # column take precedence over matches in the eISSN column.
+    # INPUT: ISSN or eISSN (string)
+    # OUTPUT: DoajJournal or None if the ISSN is not listed in the DOAJ
+    def lookup(self, issn):
+        if issn is None:
+            return None
+        journal = self.byISSN.get(issn)
+        if journal is None:
+            journal = self.byEISSN.get(issn)
+        return journal
+
+    # Return the journals of several Documents: first via ISSN, then eISSN,
+    # then (if setLinking was called) via the ISSN-L of ISSN and eISSN
+    # INPUT: list of Documents
+    # OUTPUT: (list of DoajJournals or None, list of booleans: found via
+    #         ISSN-L)
+    def lookupDocs(self, docList):
+        journals = []
+        for item in docList:
+            journal = self.lookup(item.ISSN)
+            if journal is None:
+                journal = self.lookup(item.eISSN)
+            journals.append(journal)
+        viaLink = [False] * len(docList)
+        missing = [i for i, journal in enumerate(journals) if journal is None]
+        if self.linking is not None and missing:
+            links = self.linking.linkAll([docList[i].ISSN for i in missing])
+            eLinks = self.linking.linkAll([docList[i].eISSN for i in missing])
+            for i, link, eLink in zip(missing, links, eLinks):
+                journal = self.byLink.get(link)
+                if journal is None:
+                    journal = self.byLink.get(eLink)
+                if journal is not None:
+                    journals[i] = journal
+                    viaLink[i] = True
+        return journals, viaLink
+
+
+# Function that checks if an ISSN/eISSN is in the DOAJ and adds doaj-data
+# to the document.
+# If docsByDOI (index DOI -> Document, see documents.indexByDOI) is given, the
+# data is added to the indexed document with the same DOI instead (used when
+# the documents to be checked were read in from a file).
+# INPUT: (list of documents to be checked, DoajIndex, index or None)
+def checkISSN(docList, doajIndex, docsByDOI=None):
+    journals, viaLink = doajIndex.lookupDocs(docList)
+    for item, journal, linked in zip(docList, journals, viaLink):
+        if journal is None or journal.startYear is None \
+        or journal.startYear > int(item.year):
+            continue
+        if docsByDOI is None:
+            doc = item
+        else:
+            doc = docsByDOI.get(item.DOI)
+            if doc is None:
+                # record is no longer part of the indexed documents
+                continue
+        doc.oaStatus = 'gold'
+        doc.checks += 'Identified via DOAJ '
+        if linked:
+            doc.checks += '(ISSN-L) '
+        if journal.APCValue != '':
+            doc.APCValue = journal.APCValue
+            doc.APCCurrency = journal.APCCurrency
+        doc.doajSubject = journal.subject
+        doc.publisher = journal.publisher
+        doc.lizenz = journal.lizenz
+    return
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import os
+import sys
+import weakref
+
+from tsvwriter import TsvWriter, extensions
+
+# Dictionary containing dbID mapped onto database name. Filled when the
+# databases are set up in section 4 of main.py.
+dbNameID = {}
+
+# List of consonants
+co = ('b', 'c', 'd', 'f', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'q', 'r',
+          's', 't', 'v', 'w', 'x', 'y', 'z', 'B', 'C', 'D', 'F', 'G', 'H', 'J',
+          'K', 'L', 'M', 'N', 'P', 'Q', 'R', 'S', 'T', 'V', 'W', 'X', 'Y', 'Z')
+
+# Set up class for databases
+class Database(object):
+    instancesdb = []
+    content = None
+    def __init__(self, name, idNummer):
+        self.__class__.instancesdb.append(weakref.proxy(self))
+        self.name = name
+        self.idNummer = idNummer
+        dbNameID[idNummer] = name
+
+
+# Attributes of a Document that often have the same value in many documents.
+# Documents share one copy of these values (see Document.compact).
+sharedFields = ('journal', 'ISSN', 'eISSN', 'publisher', 'year', 'subject')
+
+# Set up class for documents. Documents use __slots__ instead of a __dict__
+# per instance, because hundreds of thousands of them are held in memory.
+class Document(object):
+    __slots__ = ('authors', 'title', 'DOI', 'journal', 'ISSN', 'eISSN',
+                 'publisher', 'year', 'affiliations', 'corrAuth', 'eMail',
+                 'subject', 'funding', 'dbID', 'nameVariant',
+                 'allNameVariants', 'doajSubject', 'lizenz', 'oaStatus',
+                 'APCValue', 'APCCurrency', 'checks', 'oaDOI1', 'oaDOI2',
+                 'oaDOI3', 'oaDOI4')
+
+    def __init__(self, authors, title, DOI, journal, ISSN, eISSN, publisher,
+                 year, affiliations, corrAuth, eMail, subject, funding, dbID):
+        self.authors = authors
+        self.title = title
+        self.DOI = DOI
+        self.journal = journal
+        self.ISSN = ISSN
+        self.eISSN = eISSN
+        self.publisher = publisher
+        self.year = year
+        self.affiliations = affiliations
+        self.corrAuth = corrAuth
+        self.eMail = eMail
+        self.subject = subject
+        self.funding = funding
+        self.dbID = dbID
+        self.nameVariant = None
+        self.allNameVariants = None
+        self.doajSubject = None
+        self.lizenz = None
+        self.oaStatus = None
+        self.APCValue = None
+        self.APCCurrency = None
+        self.checks = ''
+        self.oaDOI1 = ''
+        self.oaDOI2 = ''
+        self.oaDOI3 = ''
+        self.oaDOI4 = ''
+
+    # Replace the values of the sharedFields by one shared copy of the string
+    def compact(self):
+        for attribute in sharedFields:
+            value = getattr(self, attribute)
+            if type(value) is str:
+                setattr(self, attribute, sys.intern(value))
+
+    # Return first three consonants of the author's name concatenated with the
+    # first 19 consonants of the title
+    def konsonanten(self):
+        d = ' '.join([''.join([i for i in self.authors if i in co]).lower()[0:3],
+        ''.join([i for i in self.title if i in co]).lower()[0:19]])
+        return d
+
+    # Return all values associated with a certain publication
+    def arry(self):
+        return [self.authors, self.title, self.oaStatus, self.DOI,
+                self.journal, self.ISSN, self.eISSN, self.publisher, self.year,
+                self.affiliations, self.allNameVariants, self.corrAuth,
+                self.nameVariant, self.eMail, self.subject, self.doajSubject,
+                self.funding, self.lizenz, dbNameID[self.dbID], self.checks,
+                self.oaDOI1, self.oaDOI2, self.oaDOI3, self.oaDOI4,
+                self.APCValue, self.APCCurrency]
+
+# Function that takes consonants from a title and turns them into a string
+# INPUT: title of a publication (string)
+# OUTPUT: first twenty consonants of the title (string)
+def kons(title):
+    d = ''.join([item for item in title if item in co]).lower()[0:19]
+    return d
+
+
+# Index Documents by their DOI. If a DOI occurs more than once only the first
+# Document counts; Documents without a DOI are left out.
+# INPUT: list of Documents
+# OUTPUT: dictionary DOI -> Document
+def indexByDOI(docList):
+    index = {}
+    for doc in docList:
+        if doc.DOI is not None and doc.DOI != '':
+            index.setdefault(doc.DOI, doc)
+    return index
+
+
+# Write Documents to a tab-separated file (one line per publication, see
+# Document.arry for the columns)
+# INPUT: (list of Documents, file name, compression of the file (None, 'gzip'
+#         or 'zstd', see tsvwriter.openOutput))
+def save_publications_data_to_file(document_list, filename_out,
+                                   compression=None):
+    print('save data to ' + filename_out + extensions[compression])
+
+    if os.path.exists(filename_out + extensions[compression]):
+        os.remove(filename_out + extensions[compression])
+
+    ch = 'authors\ttitle\tOA-Status\tDOI\tjournal\tISSN\teISSN\tpublisher\tyear\t'  + \
+        'affiliations\tall identified name variants\tcorresponding author\t'        + \
+        'found name variant\te-mail\tsubject\tDOAJ subject\tfunding\tlicence\t'     + \
+        'databaseID\tnotes\toaDOI[is_oa]\toaDOI[journal_is_oa]\toaDOI[host_type]\t' + \
+        'oaDOI[license]\tAPC Amount\tAPC Currency'
+
+    with TsvWriter(filename_out, ch, quoted=False,
+                   compression=compression) as writer:
+        for d in document_list:
+            writer.writerow(d.arry())
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import os
+import re
+
+import numpy as np
+
+from snapshot import fileFingerprint
+
+# An ISSN somewhere in a string: 4 digits, optionally a hyphen (or space),
+# 3 digits and the check digit (0-9 or X). Surrounding digits (e.g. of an
+# ISBN) are not allowed.
+issnPattern = re.compile('(?<![0-9])([0-9]{4})[-\u2010-\u2015 ]?'
+                         '([0-9]{3})([0-9Xx])(?![0-9])')
+
+# A normalized ISSN (see normalizeISSNs)
+normalizedPattern = re.compile('[0-9]{4}-[0-9]{3}[0-9X]$')
+
+# Weights of the first seven digits in the check digit (ISO 3297)
+weights = np.arange(8, 1, -1)
+
+# Powers of ten used to split numbers into their digits
+powers = 10 ** np.arange(6, -1, -1)
+
+
+# Compute the check digits of ISSNs
+# INPUT: numpy array with the first seven digits of every ISSN as a number
+# OUTPUT: numpy array with the check digits (10 stands for 'X')
+def checkDigits(numbers):
+    digits = (numbers[:, np.newaxis] // powers) % 10
+    return (-(digits * weights).sum(axis=1)) % 11
+
+
+# Turn numbers (first seven digits) into ISSNs in the form 'NNNN-NNNC'
+# INPUT: numpy array of numbers
+# OUTPUT: list of ISSNs (strings)
+def formatISSNs(numbers):
+    return ['%04d-%03d%s' % (number // 1000, number % 1000,
+                             'X' if check == 10 else check)
+            for number, check in zip(numbers.tolist(),
+                                     checkDigits(numbers).tolist())]
+
+
+# Normalize ISSNs as they appear in the database exports (e.g. '12345678',
+# 'ISSN 1234-5678', '1234-567x (Electronic)', '1234-5678, 8765-4321') to the
+# form 'NNNN-NNNC'. The first ISSN with a correct check digit in a value is
+# used; if there is none, the first ISSN-like string is kept (it can still
+# match the same typo in the DOAJ) unless strict is True. Every distinct value
+# is only parsed once and the check digits of all values are verified at
+# once.
+# INPUT: (list of values (strings or None), strict)
+# OUTPUT: list of normalized ISSNs; None for values without an ISSN
+def normalizeISSNs(values, strict=False):
+    distinct = list(dict.fromkeys(values))
+    owners = []
+    numbers = []
+    checks = []
+    for i, value in enumerate(distinct):
+        if not value:
+            continue
+        for first, second, check in issnPattern.findall(str(value)):
+            owners.append(i)
+            numbers.append(int(first + second))
+            checks.append(10 if check in 'Xx' else int(check))
+    normalized = {}
+    if numbers:
+        numbers = np.array(numbers, dtype=np.int64)
+        valid = checkDigits(numbers) == np.array(checks)
+        for i, issn in zip(np.array(owners)[valid].tolist(),
+                           formatISSNs(numbers[valid])):
+            normalized.setdefault(distinct[i], issn)
+        if not strict:
+            for i, number, check in zip(owners, numbers.tolist(), checks):
+                normalized.setdefault(distinct[i], '%04d-%03d%s' % (
+                    number // 1000, number % 1000,
+                    'X' if check == 10 else check))
+    return [normalized.get(value) for value in values]
+
+
+# Normalize a single ISSN (see normalizeISSNs)
+def normalizeISSN(value, strict=False):
+    return normalizeISSNs([value], strict)[0]
+
+
+# Normalize ISSN and eISSN of a list of Documents. If only an eISSN is left,
+# it stays in the eISSN field. Values without an ISSN are left as they are
+# (see DoajIndex.keys): empty values are set to None in section 7 of main.py,
+# and documents with another value are not sent to CrossRef, as before.
+# INPUT: list of Documents
+def normalizeDocISSNs(docList):
+    for field in ('ISSN', 'eISSN'):
+        values = [getattr(doc, field) for doc in docList]
+        for doc, value in zip(docList, normalizeISSNs(values)):
+            if value is not None:
+                setattr(doc, field, value)
+
+
+# Set up class for the linking ISSN (ISSN-L) of ISSNs. All ISSNs of a journal
+# (print, electronic, ...) share one ISSN-L. The table is kept as two sorted
+# numpy arrays of the first seven digits of ISSN and ISSN-L.
+class IssnLinking(object):
+    def __init__(self, issns, links):
+        order = np.argsort(issns)
+        self.issns = issns[order]
+        self.links = links[order]
+
+    def __len__(self):
+        return len(self.issns)
+
+    # Return the ISSN-L of several ISSNs. Values that are not normalized
+    # ISSNs (e.g. 'n/a' in the DOAJ) are skipped.
+    # INPUT: list of normalized ISSNs (or None)
+    # OUTPUT: list of ISSN-Ls; None for ISSNs not in the table
+    def linkAll(self, issns):
+        known = [i for i, issn in enumerate(issns)
+                 if issn and normalizedPattern.match(issn)]
+        numbers = np.array([int(issns[i][0:4] + issns[i][5:8])
+                            for i in known], dtype=np.int64)
+        positions = np.searchsorted(self.issns, numbers)
+        positions[positions == len(self.issns)] = 0
+        found = self.issns[positions] == numbers if len(self.issns) \
+                else np.zeros(len(numbers), dtype=bool)
+        result = [None] * len(issns)
+        links = formatISSNs(self.links[positions[found]])
+        for i, link in zip(np.array(known, dtype=np.intp)[found].tolist(),
+                           links):
+            result[i] = link
+        return result
+
+    def link(self, issn):
+        return self.linkAll([issn])[0]
+
+
+# Read in the ISSN-L table published by the ISSN International Centre
+# ('ISSN-to-ISSN-L.txt': tab-separated, columns ISSN and ISSN-L, one header
+# line)
+# INPUT: file name
+# OUTPUT: IssnLinking
+def readIssnLinking(fileName):
+    issns = []
+    links = []
+    with open(fileName, encoding='utf-8') as f:
+        next(f, None)
+        for line in f:
+            fields = line.split('\t')
+            if len(fields) < 2:
+                continue
+            issns.append(fields[0].strip())
+            links.append(fields[1].strip())
+    issns = normalizeISSNs(issns, strict=True)
+    links = normalizeISSNs(links, strict=True)
+    pairs = [(int(a[0:4] + a[5:8]), int(b[0:4] + b[5:8]))
+             for a, b in zip(issns, links) if a and b]
+    data = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    return IssnLinking(data[:, 0], data[:, 1])
+
+
+# Load the IssnLinking for an ISSN-L table. The arrays are saved to a numpy
+# file (indexFile) the first time; afterwards they are loaded from there as
+# long as the fingerprint of the table did not change (see
+# doaj.loadDoajIndex).
+# INPUT: (file name of the ISSN-L table, file name of the numpy file or None)
+# OUTPUT: IssnLinking
+def loadIssnLinking(linkFile, indexFile=None):
+    if indexFile is not None and os.path.exists(indexFile):
+        with np.load(indexFile) as data:
+            source = {'size': int(data['size']), 'mtime': float(data['mtime']),
+                      'sha1': str(data['sha1'])}
+            if fileFingerprint(linkFile, source)['sha1'] == source['sha1']:
+                return IssnLinking(data['issns'], data['links'])
+    linking = readIssnLinking(linkFile)
+    if indexFile is not None:
+        source = fileFingerprint(linkFile)
+        # np.savez adds '.npz' to names without it
+        with open(indexFile + '.tmp', 'wb') as f:
+            np.savez(f, issns=linking.issns, links=linking.links, **source)
+        os.replace(indexFile + '.tmp', indexFile)
+    return linking
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import collections
+
+
+# Set up class that checks a text for the name variants of all institutions
+# at once. Name variants have the format [[var1,var2],[var3]] = (var1 AND
+# var2) OR (var3), see institutionNames below.
+# The matcher is compiled once: every word that occurs in any name variant is
+# numbered, and words shared by many name variants (e.g. 'Berlin') come
+# first. When a text is checked each word is searched for at most once and a
+# name variant is dropped as soon as one of its words is missing.
+# INPUT: list of (name of institution, name variants)
+class InstitutionMatcher(object):
+    def __init__(self, nameVariants):
+        freq = collections.Counter(word for name, variants in nameVariants
+                                   for variant in variants
+                                   for word in set(variant))
+        self.words = sorted(freq, key=lambda word: (-freq[word], word))
+        wordID = {word: i for i, word in enumerate(self.words)}
+        self.institutions = [
+            (name, [tuple(sorted(wordID[word] for word in set(variant)))
+                    for variant in variants])
+            for name, variants in nameVariants]
+
+    # INPUT: text string with name of an institution
+    # OUTPUT: (bool stating if one of the instititions was found, names of
+    #         institutions that have been found separated by '; ' or None)
+    def match(self, text):
+        found = {}
+        names = []
+        for name, variants in self.institutions:
+            for variant in variants:
+                for i in variant:
+                    present = found.get(i)
+                    if present is None:
+                        present = found[i] = self.words[i] in text
+                    if not present:
+                        break
+                else:
+                    names.append(name)
+                    break
+        if names:
+            return (True, '; '.join(names))
+        return (False, None)
+
+
+# Name variants of the institutions, used by main.py (section 3) and by
+# benchmarks/bench.py. Format for name variants:
+# [[var1,var2],[var3]] is equivalent to: (var1 AND var2) OR (var3)
+# Careful: the name variant used when querying the database is not
+# necessarily the same name variant used in the raw data.
+
+# TU
+TUnames = [['Tech', 'Univ', 'Berlin'], ['Berlin', 'TU'],
+           ['Berlin', 'Inst', 'Technol']]
+
+# TU is a very generic name, so a second set of name variants is used when
+# searching strings with more than one affiliation in them (nameVar1)
+TUnames1 = [['Technische Universitat Berlin'],
+            ['Technische Universitaet Berlin'],
+            ['Technische Universität Berlin'],
+            ['Berlin Institute of Techn'],
+            ['Tech Univ Berlin'],
+            ['Berlin Univ Technol'],
+            ['Univ Technol Berlin'],
+            ['TU Berlin'],
+            ['Tech. Univ. Berlin'],
+            ['Technical Univ. of Berlin'],
+            ['Berlin Inst Technol'],
+            ['Technical University Berlin'],
+            ['Technische Universitaet de Berlin'],
+            ['Technical University of Berlin'],
+            ['Berlin University of Technology']]
+
+# TODO: not recognized
+#
+# Tech Univ, Fachgebiet Bauinformat, Berlin, Germany
+# Technol Univ Berlin
+# Tech Univ, Berlin
+# Berlin Tech Univ
+# TU, Berlin
+# Technical University (TU) Berlin
+# Technischen Universität Berlin
+# Technische Universität, Berlin
+# Technische Univerisitaet Berlin
+# Berlin, TU
+# Technical University, Berlin
+# Tech. Univ., Berlin
+# Technical University in Berlin
+
+# Charité
+Cnames = [['Charit', 'Univ'],
+          ['Campus', 'Virchow', 'Berlin'],
+          ['Campus', 'Franklin', 'Berlin'],
+          ['Campus', 'Buch', 'Berlin'],
+          ['Campus', 'Mitte', 'Berlin'],
+          ['Charit', 'Berlin'],
+          ['Berlin', 'Inst', 'Health'],
+          ['Berlin', 'Inst', 'Gesundheitsforschung'],
+          ['medizin', 'Berlin'],
+          ['Medical', 'Univ', 'Berlin'],
+          ['Medical', 'School', 'Berlin']]
+
+# TODO: Univ Med Berlin = Charité?
+
+# FU
+FUnames = [['Berlin', 'FU'], ['Berlin', 'Free Univ'],
+           ['Berlin', 'Freie', 'Univ'], ['Univ', 'Libre', 'Berlin']]
+
+# TODO: not recognized
+# 
+# Frei Univ Berlin
+# Frei Universität Berlin
+# Frei Universitaet Berlin
+
+# HU
+HUnames = [['Berlin', 'HU'],
+           ['Berlin', 'Humboldt', 'Univ']]
+
+# TODO: not recognized
+# 
+# Humboldt University
+# Humboldt-Universität
+# Humboldt University
+# Humbolt Univ Berlin
+
+# UdK
+UdKnames = [['Univ', 'Arts', 'Berlin'],
+            ['Univ', 'Kunst', 'Berlin'],
+            ['Berlin', 'UdK']]
+
+# TODO: not recognized
+# 
+# Universität der Künste, Berlin
+# Universität der Künste Berlin
+
+# Beuth
+Bnames = [['Beuth', 'Berlin']]
+
+# HTW
+HTWnames = [['HTW', 'Berlin'],
+            ['Tech', 'Wirt', 'Berlin']]
+
+# HWR
+HWRnames = [['HWR', 'Berlin'],
+            ['Wirt', 'Recht', 'Berlin'],
+            ['Berlin', 'Economics', 'Law', 'School']]
+# TO DO: not recognized
+# Berlin Sch Econ & Law, Berlin
+
+# Alice Salomon
+ASHnames = [['Alice', 'Salomon', 'Berlin'], ['ASH', 'Berlin'],
+            ['Universidad Alice Salomon']]
+
+# List of institutions: (name, name variants, second set of name variants or
+# None if the name variants are used for both)
+institutionNames = [('TU', TUnames, TUnames1),
+                    ('Charité', Cnames, None),
+                    ('FU', FUnames, None),
+                    ('HU', HUnames, None),
+                    ('UdK', UdKnames, None),
+                    ('Beuth', Bnames, None),
+                    ('HTW', HTWnames, None),
+                    ('HWR', HWRnames, None),
+                    ('ASH', ASHnames, None)]
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Analyse several years at once. For every year there has to be one export
+# per database in 'input-files', named like the files in section 4 of main.py
+# (e.g. 'wos2015.txt', 'wos2016.txt', ...).
+# main.py is run once per year in its own folder 'years/<year>' (output files,
+# snapshots and caches of a year are kept there), using up to 'workers'
+# processes at a time. Afterwards the results are merged into
+# 'output-files/statistics_OA.txt' and 'output-files/allPubs.txt'.
+# All other settings are taken from section 1 of main.py; settings given via
+# OAEVAL_SETTINGS (see section 1 of main.py) are used for every year.
+#
+# Usage (in the folder containing main.py and 'input-files'):
+#   python multiyear.py 2015 2024 --workers 4
+
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import subprocess
+import sys
+
+from prettytable import PrettyTable
+
+from doaj import loadDoajIndex
+from tsvwriter import openInput, openOutput, writeTsv
+
+# Folder containing one folder per year
+partitionDir = 'years'
+
+# Files and folders shared by all years (linked into the folder of every year)
+sharedFiles = ['input-files', 'RIS-fields.csv', 'doaj.snapshot']
+
+
+# Return the files in 'input-files' belonging to a year
+def yearFiles(year):
+    return sorted(glob.glob(os.path.join('input-files', '*%d.*' % year)))
+
+
+# Set up the folder of a year
+# INPUT: year
+# OUTPUT: name of the folder
+def preparePartition(year):
+    folder = os.path.join(partitionDir, str(year))
+    if not os.path.exists(os.path.join(folder, 'output-files')):
+        os.makedirs(os.path.join(folder, 'output-files'))
+    for name in sharedFiles:
+        link = os.path.join(folder, name)
+        if not os.path.lexists(link):
+            os.symlink(os.path.abspath(name), link)
+    return folder
+
+
+# Run main.py for one year. The console output is saved to 'stdout.txt' in
+# the folder of the year. Settings given via OAEVAL_SETTINGS are kept; the
+# year and the number of processes take precedence.
+# INPUT: (year, folder of the year, number of processes for reading in)
+# OUTPUT: exit code of main.py
+def runPartition(year, folder, readInWorkers):
+    settings = json.loads(os.environ.get('OAEVAL_SETTINGS', '{}'))
+    settings.update({'yearMin': year, 'yearMax': year, 'exportYear': year,
+                     'readInWorkers': readInWorkers})
+    env = dict(os.environ, OAEVAL_SETTINGS=json.dumps(settings))
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'main.py')
+    with open(os.path.join(folder, 'stdout.txt'), 'w') as out:
+        return subprocess.run([sys.executable, script], cwd=folder, env=env,
+                              stdout=out, stderr=subprocess.STDOUT).returncode
+
+
+# Read in the yearly rows of a file 'statistics_OA.txt' (without the sum)
+# OUTPUT: (header, list of rows (lists of strings))
+def readStatistics(fileName):
+    with open(fileName, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    rows = [[x.strip('"') for x in line.split('\t')] for line in lines[1:]
+            if line.strip()]
+    return lines[0], [row for row in rows if row[0] != 'Sum']
+
+
+# Percentage as computed in section 12 of main.py
+def percentage(part, whole):
+    if whole == 0:
+        return 0
+    return round(float(100 * part)/float(whole), 1)
+
+
+# Merge the yearly rows of all years, add the sum and save the table to file
+# (same format as in section 12 of main.py)
+# INPUT: (header, list of rows, file name)
+def writeStatistics(header, rows, fileName):
+    rows = sorted(rows, key=lambda row: int(row[0]))
+    pubAll, pubOA, pubHybrid, pubGreen, pubOACorr = \
+        [sum(int(row[k]) for row in rows) for k in (1, 2, 4, 6, 8)]
+    total = ['Sum', pubAll, pubOA, percentage(pubOA, pubAll),
+             pubHybrid, percentage(pubHybrid, pubAll),
+             pubGreen, percentage(pubGreen, pubAll),
+             pubOACorr, percentage(pubOACorr, pubOA)]
+    writeTsv(fileName, rows + [[str(x) for x in total]], header)
+
+    ta = PrettyTable(['year', '# Publications', '# Gold',
+                      '# Hybrid', '# Green', '# OA P. + Corr. Author'])
+    for row in rows + [None, [str(x) for x in total]]:
+        if row is None:
+            ta.add_row(['----', '----', '----', '----', '----', '----'])
+            continue
+        ta.add_row([row[0], row[1], row[2] + ' ~ ' + row[3] + ' %',
+                    row[4] + ' ~ ' + row[5] + ' %',
+                    row[6] + ' ~ ' + row[7] + ' %',
+                    row[8] + ' ~ ' + row[9] + ' %'])
+    print(ta)
+
+
+# Concatenate the files 'allPubs.txt' of all years (compressed files, see
+# outputCompression in main.py, are found via their extension)
+# INPUT: (list of file names, name of merged file)
+def mergePublications(fileNames, fileName):
+    with openOutput(fileName) as out:
+        for i, name in enumerate(fileNames):
+            with openInput(name) as f:
+                header = f.readline()
+                if i == 0:
+                    out.write(header)
+                for line in f:
+                    out.write(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run main.py for several years and merge the results')
+    parser.add_argument('first', type=int, help='first year')
+    parser.add_argument('last', type=int, help='last year')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='number of years processed at the same time')
+    args = parser.parse_args()
+
+    years = []
+    for year in range(args.first, args.last + 1):
+        if yearFiles(year):
+            years.append(year)
+        else:
+            print('No files for ' + str(year) + ' in input-files - skipped')
+    if not years:
+        return
+
+    # Compile the DOAJ data once instead of in every process (see section 7
+    # of main.py)
+    loadDoajIndex('input-files/doaj.txt', 'doaj.snapshot')
+
+    workers = max(1, min(args.workers, len(years)))
+    readInWorkers = max(1, (os.cpu_count() or 1) // workers)
+    folders = {year: preparePartition(year) for year in years}
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        codes = dict(zip(years, pool.map(
+            lambda year: runPartition(year, folders[year], readInWorkers),
+            years)))
+
+    header = None
+    rows = []
+    pubFiles = []
+    for year in years:
+        outputDir = os.path.join(folders[year], 'output-files')
+        if codes[year] != 0:
+            print('Error in ' + str(year) + ', see ' +
+                  os.path.join(folders[year], 'stdout.txt'))
+            continue
+        print('Finished ' + str(year))
+        statsFile = os.path.join(outputDir, 'statistics_OA.txt')
+        if os.path.exists(statsFile):
+            header, yearRows = readStatistics(statsFile)
+            rows += yearRows
+        pubFiles.append(os.path.join(outputDir, 'allPubs.txt'))
+
+    if not os.path.exists('output-files'):
+        os.makedirs('output-files')
+    if rows:
+        writeStatistics(header, rows, 'output-files/statistics_OA.txt')
+    if pubFiles:
+        mergePublications(pubFiles, 'output-files/allPubs.txt')
+    print('Saved merged results to "output-files"')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,702 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import numpy as np
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import re
+import time
+from documents import Document
+from issn import normalizeDocISSNs
+from runreport import currentRSS, stageMemory
+from snapshot import Snapshot, fileFingerprint, writeSnapshot
+
+# Function to identify corresponding authors (= first authors) in Inspec data
+# INPUT: list of authors of a publication, list of their affiliations
+# OUTPUT: first author; associated affiliation (string)
+def inspecCorrAuth(auth, affil):
+    authorList = auth.split('; ')
+    affilList = affil.split('; ')
+    if authorList[0] in affilList:
+        firstAuth = affilList.index(authorList[0])
+    else:
+        return None
+    while firstAuth < len(affilList) and affilList[firstAuth] in authorList:
+        firstAuth += 1
+    if firstAuth + 1 == len(affilList):
+        tempor = affilList[-1]
+    elif firstAuth < len(affilList):
+        tempor = affilList[firstAuth].split('.')[:-2]
+    return authorList[0] + '; ' + ''.join(tempor)
+
+# Function that takes data in WoS-format and transforms the data into a list of
+# Document-objects.
+# !This function is not really needed in this script as it is right now!
+# It's being included for the purpose of easily adding new databases to the
+# script. To do this export article data from Citavi in the WoS-format and use
+# this function to do the read-in for the data
+# INPUT: (list of records in WoS-format, database ID (integer))
+# OUTPUT: list of Document-objects
+def wosFormat(wosRecords, ind):
+    records = []
+    i = 0
+    with open(wosRecords, 'r', newline=None) as f:
+        for line in f:
+            if i == 0:
+                newDoc = Document('', '', None, None, None, None,
+                                  None, None, '', None, None, None, None, ind)
+                i += 1
+            le = len(line)
+            if line[0:2] != '  ':
+                kuerzel = line[0:2]
+            if line[0:2] == 'TI':
+                newDoc.title = line[3:le].strip('\n').strip('\r')
+            elif line[0:2] == 'SO':
+                newDoc.journal = line[3:le].strip('\n').strip('\r')
+            elif line[0:2] == 'PY':
+                newDoc.year = line[3:le].strip('\n').strip('\r')
+            elif line[0:2] == 'SN':
+                if '-' not in line:
+                    vorl = line[3:le].strip('ISSN ').strip('\n').strip('\r')
+                    newDoc.ISSN = vorl[0:4] + '-' + vorl[4:8]
+                elif ',' in line:
+                    newDoc.ISSN = line.strip('ISSN ').strip('\n').strip('\r')[0:9]
+                else:
+                    newDoc.ISSN = line[3:le].strip('ISSN ').strip('\n').strip('\r')
+            elif line[0:2] == 'DI':
+                newDoc.DOI = line[3:le].strip('\n').strip('\r')
+            elif line[0:2] == 'AF':
+                newDoc.authors = line[3:le].strip('\n').strip('\r')
+            elif kuerzel == 'AF' and line[0:2] == '  ':
+                newDoc.authors += '; '
+                newDoc.authors += line[3:le].strip('\n').strip('\r')
+            elif line[0:2] == 'FN':
+                records.append(newDoc)
+                newDoc = Document('', '', None, None, None, None,
+                                  None, None, '', None, None, None, None, ind)
+        records.append(newDoc)
+    return records
+
+# Function that takes data in PubMed-format and transforms it into a list of
+# Documents.
+# INPUT: (PubMed-records, database ID (integer))
+# OUTPUT: list of Documents
+def pubmedFormat(pmRecords, ind):
+    records = []
+    i = 0
+    authorCount = 0
+    newDoc = None
+    with open(pmRecords, 'r', newline=None) as f:
+        for line in f:
+            lengths = len(line)
+            if line[0:2] != '  ':
+                kuerzel = line[0:4]
+            if line[0:4] == 'PMID':
+                authorCount = 0
+                if i > 0:
+                    records.append(newDoc)
+                newDoc = Document('', '', None, None, None, None,
+                                  None, None, '', None, None, None, None, ind)
+                i += 1
+            elif line[0:2] == 'TI':
+                newDoc.title = line[6:lengths].strip('\n').strip('\r')
+            elif kuerzel == 'TI  ' and line[0:2] == '  ':
+                newDoc.title += ' '
+                newDoc.title += line[6:lengths].strip('\n').strip('\r')
+            elif line[0:2] == 'IS' and line[-5:-2] == 'nic':
+                newDoc.eISSN = line[6:15]
+            elif line[0:2] == 'IS' and line[-5:-2] == 'ing':
+                newDoc.ISSN = line[6:15]
+            elif line[0:3] == 'FAU' and authorCount > 0:
+                newDoc.authors += '; '
+                newDoc.authors += line[6:lengths].strip('\n').strip('\r')
+                authorCount += 1
+            elif line[0:3] == 'FAU' and authorCount == 0:
+                newDoc.authors = line[6:lengths].strip('\n').strip('\r')
+                newDoc.corrAuth = newDoc.authors + '; '
+                authorCount += 1
+            elif authorCount == 1 and line[0:2] == 'AD':
+                newDoc.corrAuth += line[6:lengths].strip('\n').strip('\r')
+                newDoc.affiliations = line[6:lengths].strip('\n').strip('\r')
+            elif line[0:2] == '  ' and kuerzel == 'AD  ' and authorCount == 1:
+                newDoc.affiliations += line[5:lengths].strip('\n').strip('\r')
+                newDoc.corrAuth += line[5:lengths].strip('\n').strip('\r')
+            elif line[0:2] == '  ' and kuerzel == 'AD  ' and authorCount > 1:
+                newDoc.affiliations += line[5:lengths].strip('\n').strip('\r')
+            elif authorCount > 1 and line[0:2] == 'AD':
+                newDoc.affiliations += '; '
+                newDoc.affiliations += line[5:lengths].strip('\n').strip('\r')
+            elif line[0:2] == 'JT':
+                newDoc.journal = line[6:lengths].strip('\n').strip('\r')
+            elif line[0:2] == 'DP':
+                newDoc.year = line[6:10]
+            elif line[0:3] == 'LID' and 'doi' in line:
+                newDoc.DOI = line[6:lengths].strip('\n').strip('\r').strip(' [doi]')
+        records.append(newDoc)
+    return records
+
+# Read in table mapping RIS-fields of databases to document-attributes
+risFields = np.genfromtxt('RIS-fields.csv', delimiter=';', dtype=None, encoding='utf-8')
+
+# Valid characters for ISSNs
+numX = ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9', 'X']
+
+def concatenate_tags(publication, tag_list):
+    # just concatenate the strings belonging to the tags in the tag_list; separate values with '; '  
+    result_list = []
+    for tag in tag_list:
+        if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+            result_list.extend(publication[tag])
+
+    if result_list:
+        return '; '.join(result_list)
+    else:
+        return None
+        
+
+
+def get_first_author_and_first_affiliation_as_string(newDoc):   
+    result_list = []
+    
+    att_authors      = getattr(newDoc, 'authors')
+    att_affiliations = getattr(newDoc, 'affiliations')
+    
+    if att_authors:
+        # if more than one author: normally separated by ;
+        first_author = att_authors.split('; ')[0]                    
+        result_list.append(first_author)
+            
+    if att_affiliations:
+        # if more than one affiliation: normally separated by ;
+        first_affiliation = att_affiliations.split('; ')[0]
+        result_list.append(first_affiliation)
+
+    return '; '.join(result_list)
+
+
+
+# Read the records of a RIS-file one at a time. A record is passed on as soon
+# as the next record starts, so the file is never held in memory as a whole.
+# INPUT: RIS-records, database-ID
+# OUTPUT: generator yielding one dictionary {tag: [data, ...]} per record
+def risPublications(risRecords, ind):
+    publication = None
+    with open(risRecords, 'r', newline=None) as f:
+        for line in f:
+            if line.strip(): # ignore empty lines
+                tag  = line[0:2]
+                data = line[6:-1].strip()
+                
+                # ignore lines that do not match the pattern "XX  - data" 
+                if not (tag.isupper() and line[2] == ' '):
+                    continue
+                
+                # ignore line with Tag 'TY' for database CINAHL
+                if ind == 12 and tag == 'TY':
+                    continue
+                
+                
+                # Start of a new record?
+                if (ind != 12 and tag == 'TY') or (ind == 12 and tag == 'ID'):
+                    if publication is not None:
+                        yield publication
+                    publication = {}
+
+                # ignore lines before the first record
+                if publication is None:
+                    continue
+
+                # enter line in data list
+                # is there an entry for that tag?
+                if not tag in publication:
+                    publication[tag] = []
+                    
+                publication[tag].append(data)
+
+    if publication is not None:
+        yield publication
+
+
+# Get the RIS-tags used by a database for each document-attribute from
+# RIS-fields.csv
+# INPUT: database-ID
+# OUTPUT: dictionary {attribute: [RIS-tags]}
+def risTags(ind):
+    ris_tags = {}
+    
+    for col_nr_db in range(len(risFields[0])):
+        if str(ind) == risFields[0][col_nr_db]:
+            break
+    
+    # get RIS-Tags for fields
+    for line_nr in range(1, len(risFields)):
+        attribute = risFields[line_nr][0]
+        if not attribute in ris_tags:
+            ris_tags[attribute] = []
+        
+        if risFields[line_nr][col_nr_db]: # falls Feld nicht leer
+            ris_tags[attribute].append(risFields[line_nr][col_nr_db])
+
+    return ris_tags
+
+
+# Read in RIS-files record by record
+# INPUT: RIS-records, database-ID
+# OUTPUT: generator yielding one Document per record
+
+def risDocuments(risRecords, ind):
+    ris_tags = risTags(ind)
+
+    #
+    # extract data for each publication
+    #
+    for publication in risPublications(risRecords, ind):
+        newDoc = Document('', '', None, None, None, None, None, None, '', None, None, None, None, ind)
+
+
+        # take fields as is; concatenate with ; if several tags 
+        for attribute in ['authors', 'title', 'journal', 'publisher']:
+            result_string = concatenate_tags(publication, ris_tags[attribute])
+            if attribute == 'title' and result_string:
+                result_string = result_string.strip('.')
+                
+            setattr(newDoc, attribute, result_string)
+
+        result_string = None
+
+        
+        
+        # affiliations
+        attribute = 'affiliations'
+        
+        if ind in [9, 13, 17]:  # BSC, EBSCO, SportDiscus
+            # nehme Affiliatin aus 'AD', wenn vorhanden, sonst 'N1'
+            for tag in ris_tags[attribute]:
+                if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+                    # Affiliationen stehen häufig im Notiz-feld N1; ist aber Fallback, nehme N1 nur, 
+                    # wenn es kein anderes Feld gibt!
+                    if tag != 'N1':
+                        attribute_string = '; '.join(publication[tag])
+                        setattr(newDoc, attribute, attribute_string)
+                        break # danach keine weiteren Tags mehr auswerten!
+                    elif tag == 'N1':
+                        attribute_string = '; '.join(publication[tag])
+                        # Affiliationen stehen im Notizfeld zusammen mit anderen Angaben
+                        # wird mit "Affiliations: " eingeleitet
+                        # angaben danach eingeleitet mit : 'Source Info:', 'Issue Info:', 'Document Type:' oder 'Release Date:'
+                        m = re.search('Affiliations?: +(.+?) +(Source Info:|Issue Info:|Document Type:|Release Date:|No. of Pages:)', attribute_string)
+                        if m:
+                            substring = m.group(1)
+                            
+                            if ind in [17]:  # SportDiscus
+                                # split into affiliations; each is marked by : 1 ,: 2 , etc, 
+                                affiliations_list = re.split(": [0-9]+ ", ': ' + substring)
+                            
+                            else:
+                                # split into affiliations; each is marked by 1: , 2: , etc, 
+                                # important: there must be whitespace ahead of the number; otherwise the match might be incorrect
+                                affiliations_list = re.split("\s[0-9]+\s*:\s*", ' ' + substring)
+                            
+                            new_affiliations_string = ''
+                            for aff in affiliations_list:
+                                if aff.strip(): # ignore empty entries
+                                    aff = aff.strip(' ;') # strip ; from end
+                                    if new_affiliations_string: 
+                                        new_affiliations_string += '; '
+                                    new_affiliations_string += aff
+                            
+                            setattr(newDoc, attribute, new_affiliations_string)
+            
+        else:
+            setattr(newDoc, attribute, concatenate_tags(publication, ris_tags[attribute]))
+                
+            
+        # DOI
+        attribute = 'DOI'
+        result_string = ''
+        if ind in [13]:
+            for tag in ris_tags[attribute]:
+                if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+                    if tag != 'N1':
+                        for attribute_string in publication[tag]:
+                            if 'doi.org' in attribute_string or attribute_string.startswith('10.'):
+                                result_string = attribute_string
+                                break # nehme nur die erste DOI
+                        if result_string: # falls Ergebnis, ddanach keine weiteren Tags mehr auswerten!
+                            break 
+                            
+                    else: # N1
+                        attribute_string = '; '.join(publication[tag])
+                        m = re.search('DOI: +([^\s]+)', attribute_string)
+                        if m:
+                            result_string = m.group(1).strip(' .')
+            
+            if result_string.strip():
+                result_string = result_string.strip()
+                if 'doi.org' in result_string:
+                    result_string = result_string[result_string.find('doi.org') + 8:]
+                
+                setattr(newDoc, attribute, result_string)
+            
+            
+        else:
+            result_string = concatenate_tags(publication, ris_tags[attribute])
+
+            if result_string and 'doi.org' in result_string:
+                result_string = result_string[result_string.find('doi.org') + 8:]
+            
+            setattr(newDoc, attribute, result_string)
+
+        result_string = None
+        
+        
+        # ISSN, eISSN
+        attribute = 'ISSN'
+        for tag in ris_tags[attribute]:
+            if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+                for attribute_string in publication[tag]: # falls es mehrere Tags gibt        
+                    
+                    if attribute_string[0:4] != '978-': 
+                        # anInt = filter(lambda x: x in numX, attribute_string.split())
+                        anInt = ''.join(filter(lambda x: x in numX, attribute_string))
+
+                        if anInt != '':
+                            # das erste Tag
+                            if getattr(newDoc, attribute) in ('', None):
+                                setattr(newDoc, attribute, anInt[0:4] + '-' + anInt[4:8])
+                                if len(anInt) > 8:
+                                    setattr(newDoc, 'eISSN', anInt[8:12] + '-' + anInt[12:16])
+                                
+                            # zweites Tag = Elektronisch
+                            else:
+                                setattr(newDoc, 'eISSN', anInt[0:4] + '-' + anInt[4:8])
+                    
+        
+        # year
+        attribute = 'year'
+        for tag in ris_tags[attribute]:
+            if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+                attribute_string = publication[tag][0] # nehme das erste Tag, ignoriere weitere 
+                if len(attribute_string) > 4:
+                    result = int(attribute_string[:4]) # beginnt mit der Jahreszahl 
+                else:
+                    result = int(attribute_string)
+                    
+                setattr(newDoc, attribute, result)
+        
+
+        # corrAuth
+        attribute = 'corrAuth'
+
+        if ris_tags[attribute]:   # if defined in RIS-fields.csv
+            
+            if ind in [16]: # Scopus
+                result_list = []
+                
+                for tag in ris_tags[attribute]:
+                    if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+                        for attribute_string in publication[tag]:
+                            m = re.search('Correspondence Address: (.+)$', attribute_string)
+                            if m:
+                                result_list.append(m.group(1))
+
+                if result_list:
+                    result_string = '; '.join(result_list)
+                    
+                else:   # nothing found in tags
+                    result_string = get_first_author_and_first_affiliation_as_string(newDoc)
+                
+                setattr(newDoc, attribute, result_string)
+                
+                result_string = None
+                result_list   = None
+            
+            else:          
+                setattr(newDoc, attribute, concatenate_tags(publication, ris_tags[attribute]))
+        
+        else:
+            # take first author + first affiliation
+            # but only if the database has information about affiliations (otherwise useless)
+            if getattr(newDoc, 'affiliations'):
+                setattr(newDoc, attribute, get_first_author_and_first_affiliation_as_string(newDoc))
+        
+        
+        # eMail
+        attribute = 'eMail'
+        
+        if ind in [9, 13, 17]:   # BSC, EBSCO, SportDiscus
+            # Mail address in notes N1 
+            result_string = ''
+            attribute_string_list = []
+            for tag in ris_tags['affiliations']:
+                if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+                    # Affiliationen stehen häfig im Notiz-feld N1; ist aber Fallback, nehme N1 nur, wenn es kein anderes Feld gibt!
+                    attribute_string_list.extend(publication[tag])
+                    if tag != 'N1':
+                        break # danach keine weiteren Tags mehr auswerten!
+
+            m = re.search('(Email Address|email): ([^\s;]+)', '; '.join(attribute_string_list))
+            if m:
+                result_string = m.group(2).strip(' ,;.')
+
+            if result_string:
+                setattr(newDoc, attribute, result_string)
+                
+            result_string = None
+            
+        elif ind in [14, 16]: # Embase, Scopus
+            result_list = []
+            
+            for tag in ris_tags['corrAuth']:  # part of the field that contains the corresponding author
+                if tag in publication:          # wenn Tag in Publications-Daten vorhanden
+                    for attribute_string in publication[tag]:
+                        m = re.search('(E-mail|email): (.+)$', attribute_string)
+                        if m:
+                            result_list.append(m.group(2))
+
+            if result_list:
+                setattr(newDoc, attribute, '; '.join(result_list))
+                
+            result_list = None
+
+        yield newDoc
+
+
+# Read in RIS-files
+# INPUT: RIS-records, database-ID
+# OUTPUT: List of documents
+def risFormat(risRecords, ind):
+    return list(risDocuments(risRecords, ind))
+
+
+# Function that takes data in tab-delimited WoS-format (as exported from the
+# Web of Science) and transforms it into a list of Documents.
+# INPUT: (file name, database ID (integer))
+# OUTPUT: list of Documents
+def wosTabFormat(fileName, ind):
+    records = []
+    with open(fileName) as f:
+        ic = 0
+        for line in f:
+            fields = line.split('\t')
+            if ic > 0:
+                records.append(
+                    Document(
+                        fields[1],     # authors
+                        fields[8],     # title
+                        fields[54],    # DOI
+                        fields[9],     # journal
+                        fields[38],    # ISSN
+                        fields[39],    # eISSN
+                        fields[35],    # publisher
+                        fields[44],    # year
+                        fields[22],    # affiliations
+                        fields[23],    # corrAuth
+                        fields[24],    # eMail
+                        fields[59],    # subject
+                        fields[27],    # funding
+                        ind
+                    )
+                )
+            else:
+                ic += 1
+    return records
+
+# Function that takes data in tab-delimited SciFinder-format and transforms
+# it into a list of Documents. The first author is added to the affiliation
+# to get the corresponding author.
+# INPUT: (file name, database ID (integer))
+# OUTPUT: list of Documents
+def sciFinderFormat(fileName, ind):
+    records = []
+    with open(fileName, 'r', newline=None) as f:
+        ic = 0
+        for line in f:
+            fields = line.split('\t')
+            if ic > 0:
+                records.append(
+                    Document(
+                        fields[6].strip('"'),                          # authors      
+                        fields[3].strip('"'),                          # title        
+                        fields[49].strip('\n').strip('\r').strip('"'), # DOI          
+                        fields[17].strip('"'),                         # journal      
+                        fields[15].strip('"'),                         # ISSN         
+                        None,                                          # eISSN        
+                        None,                                          # publisher    
+                        fields[22].strip('"'),                         # year         
+                        fields[11].strip('"'),                         # affiliations 
+                        fields[11].strip('"'),                         # corrAuth     
+                        None,                                          # eMail        
+                        fields[9].strip('"'),                          # subject      
+                        None,                                          # funding      
+                        ind
+                    )
+                )
+            else:
+                ic += 1
+    for item in records:
+        firstAuthor = item.authors.split('; ')[0]
+        item.corrAuth = firstAuthor + '; ' + item.corrAuth
+    return records
+
+# Function that takes data in tab-delimited Inspec-format and transforms it
+# into a list of Documents.
+# INPUT: (file name, database ID (integer))
+# OUTPUT: list of Documents
+def inspecFormat(fileName, ind):
+    records = []
+    with open(fileName) as f:
+        ic = 0
+        for line in f:
+            fields = line.split('\t')
+            if ic > 0:
+                records.append(
+                    Document(
+                        fields[6],                             # authors      
+                        fields[5],                             # title        
+                        fields[51],                            # DOI          
+                        fields[12],                            # journal      
+                        fields[50],                            # ISSN         
+                        None,                                  # eISSN        
+                        fields[41],                            # publisher    
+                        fields[13],                            # year         
+                        fields[35],                            # affiliations 
+                        inspecCorrAuth(fields[6], fields[35]), # corrAuth     
+                        None,                                  # eMail        
+                        None,                                  # subject      
+                        None,                                  # funding      
+                        ind
+                    )
+                )
+            else:
+                ic += 1
+    return records
+
+# Functions reading in the different file formats
+readFormats = {
+    'wos': wosFormat,
+    'wosTab': wosTabFormat,
+    'sciFinder': sciFinderFormat,
+    'inspec': inspecFormat,
+    'pubmed': pubmedFormat,
+    'ris': risFormat
+}
+
+# Read in one database file. Used as worker function by readDatabases
+# INPUT: (format (key of readFormats), file name, database ID (integer))
+# OUTPUT: list of Documents
+def readDatabase(fileFormat, fileName, ind):
+    return readFormats[fileFormat](fileName, ind)
+
+# Same as readDatabase, but also measures the reading in (see runreport.py)
+# OUTPUT: (list of Documents, wall time, CPU time, memory of the process
+#         (see runreport.stageMemory))
+def readDatabaseTimed(fileFormat, fileName, ind):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    rss = currentRSS()
+    content = readDatabase(fileFormat, fileName, ind)
+    return (content, time.perf_counter() - wall, time.process_time() - cpu,
+            stageMemory(rss))
+
+# Read in the files of several databases using up to 'workers' processes and
+# set the content of the databases. The contents are assigned in the order of
+# the list, independent of which file is read in first.
+# main.py runs all of its sections when it is imported, so the processes are
+# started via 'fork' (which does not import main.py again). Where 'fork' is
+# not available (Windows) the files are read in one after the other.
+# If a cache directory is given, the content of every file is saved there as
+# a snapshot together with a fingerprint of the file. On the next run files
+# whose fingerprint (and format, database ID and - for RIS-files - the
+# fingerprint of RIS-fields.csv) did not change are loaded from the cache
+# instead of being read in again.
+# If a RunReport is given, the time needed for every file is added to it.
+# INPUT: (list of (Database, format, file name), number of processes,
+#         cache directory or None, RunReport or None)
+def readDatabases(inputFiles, workers, cacheDir=None, report=None):
+    fingerprints = {}
+    if cacheDir is not None:
+        fingerprintFile = os.path.join(cacheDir, 'fingerprints.json')
+        if not os.path.exists(cacheDir):
+            os.makedirs(cacheDir)
+        if os.path.exists(fingerprintFile):
+            with open(fingerprintFile, encoding='utf-8') as f:
+                fingerprints = json.load(f)
+        risFieldsPrint = fileFingerprint('RIS-fields.csv',
+                                         fingerprints.get('RIS-fields.csv'))
+        newPrints = {'RIS-fields.csv': risFieldsPrint}
+
+    cached = {}
+    toRead = []
+    for db, fileFormat, fileName in inputFiles:
+        if cacheDir is not None:
+            old = fingerprints.get(fileName)
+            new = {'format': fileFormat, 'dbID': db.idNummer,
+                   'file': fileFingerprint(fileName,
+                                           old['file'] if old else None),
+                   'fields': risFieldsPrint['sha1']
+                             if fileFormat == 'ris' else None}
+            newPrints[fileName] = new
+            snapshotFile = os.path.join(cacheDir,
+                                        str(db.idNummer) + '.snapshot')
+            if old is not None and os.path.exists(snapshotFile) \
+            and [old[k] for k in ('format', 'dbID', 'fields')] == \
+                [new[k] for k in ('format', 'dbID', 'fields')] \
+            and old['file']['sha1'] == new['file']['sha1']:
+                wall = time.perf_counter()
+                cpu = time.process_time()
+                rss = currentRSS()
+                snapshot = Snapshot(snapshotFile)
+                content = snapshot.documents()
+                snapshot.close()
+                cached[fileName] = (content, time.perf_counter() - wall,
+                                    time.process_time() - cpu,
+                                    stageMemory(rss))
+                continue
+        toRead.append((db, fileFormat, fileName))
+
+    fileFormats = [fileFormat for db, fileFormat, fileName in toRead]
+    fileNames = [fileName for db, fileFormat, fileName in toRead]
+    ids = [db.idNummer for db, fileFormat, fileName in toRead]
+    if workers is not None and workers > 1 and len(toRead) > 1 \
+    and 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        with concurrent.futures.ProcessPoolExecutor(
+                workers, mp_context=context) as pool:
+            contents = list(pool.map(readDatabaseTimed, fileFormats,
+                                     fileNames, ids))
+    else:
+        contents = map(readDatabaseTimed, fileFormats, fileNames, ids)
+    contents = dict(zip(fileNames, contents))
+
+    for db, fileFormat, fileName in inputFiles:
+        if fileName in cached:
+            content, wall, cpu, memory = cached[fileName]
+            print('Loaded unchanged ' + db.name + ' from ' + cacheDir)
+        else:
+            content, wall, cpu, memory = contents[fileName]
+            if cacheDir is not None:
+                writeSnapshot(content, os.path.join(
+                    cacheDir, str(db.idNummer) + '.snapshot'))
+            print('Finished reading in ' + db.name)
+        # ISSNs are normalized after reading in (and loading from the cache),
+        # so that changes of the normalization don't require a new read-in
+        normalizeDocISSNs(content)
+        for doc in content:
+            doc.compact()
+        db.content = content
+        if report is not None:
+            report.add('ingest ' + db.name, wall, cpu, memory,
+                       records=len(content),
+                       source='cache' if fileName in cached else fileName)
+
+    if cacheDir is not None:
+        with open(fingerprintFile, 'w', encoding='utf-8') as f:
+            json.dump(newPrints, f, indent=1)
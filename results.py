@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Final results of a run (sections 11 and 12 of main.py). The results only
+# depend on the list of Documents, so they can be created again from the
+# snapshot 'enriched.snapshot' without running the other sections (see
+# 'python cli.py report').
+
+import itertools
+
+from prettytable import PrettyTable
+
+from documents import save_publications_data_to_file
+from stats import (DocTable, goldPublishers, institutionStatistics,
+                   publisherRanking, yearStatistics)
+from tsvwriter import writeTsv
+
+
+# Print the number of OA articles and the estimated APCs and save all
+# publications to 'output-files/allPubs.txt'
+# INPUT: (list of Documents, compression of allPubs.txt (see
+#         outputCompression in main.py))
+def printResults(finalList, compression=None):
+    print('\n')
+    print('Overall number of articles: ', len(finalList), '\n')
+    oaGoldNumber = len([item for item in finalList if item.oaStatus == 'gold'])
+    print('Number of gold OA articles ', oaGoldNumber, '\n')
+    oaHybridNumber = len([item for item in finalList if item.oaStatus == 'hybrid'])
+    print('Number of hybrid OA articles ', oaHybridNumber, '\n')
+    oaGreenNumber = len([item for item in finalList if item.oaStatus == 'green'])
+    print('Number of green OA articles ', oaGreenNumber, '\n')
+    corrAuthNumber = len([item for item in finalList if item.oaStatus == 'gold'
+                          and item.nameVariant is not None])
+    print('Number of articles in DOAJ-journals where author from relevant \
+institution is corresponding author: ', corrAuthNumber, '\n')
+
+    # Estimate APCs
+    print('Estimated APCs (assume 1481 €): ', corrAuthNumber * 1481, ' €\n')
+
+    # Estimate APCs based on DOAJ
+    withAPC = [item for item in finalList if item.oaStatus == 'gold'
+               and item.nameVariant is not None and item.APCValue is not None]
+    allCurrencies = set([item.APCCurrency for item in withAPC])
+    APCAmounts = [[0 for x in range(2)] for y in range(len(allCurrencies))]
+    h = 0
+    for curr in allCurrencies:
+        APCAmounts[h][0] = sum([int(item.APCValue) for item in withAPC
+                                if item.APCCurrency == curr])
+        APCAmounts[h][1] = curr
+        h += 1
+    print('The DOAJ provides APC-amounts for ', len(withAPC), ' of ', \
+    corrAuthNumber, ' gold OA-publications where the corresponding author is from \
+a relevant institution. These add up to the following amounts:\n')
+    for h in range(len(allCurrencies)):
+        print(APCAmounts[h][0], '\t', APCAmounts[h][1], '\n')
+
+    # Save results to file
+    save_publications_data_to_file(finalList, 'output-files/allPubs.txt',
+                                   compression)
+
+
+# Print and save the statistics per year, per publisher and per institution
+# INPUT: (list of Documents, names of the institutions (see section 3 of
+#         main.py))
+def printStatistics(finalList, institutionNames):
+    # Count OA/Hybrid/CorrAuth for every year in dataset (see stats.py)
+    docTable = DocTable(finalList)
+    years, pubAll, pubOA, pubHybrid, pubGreen, pubOACorr = \
+        yearStatistics(docTable)
+    lenyr = len(years)
+    percOA = [None] * lenyr
+    percOACorr = [None] * lenyr
+    percHybrid = [None] * lenyr
+    percGreen = [None] * lenyr
+    ta = PrettyTable(['year', '# Publications', '# Gold',
+                     '# Hybrid', '# Green', '# OA P. + Corr. Author'])
+
+    # Create table content
+    for i in range(0, lenyr):
+        percOA[i] = round(float(100 * pubOA[i])/float(pubAll[i]), 1)
+        if pubOA[i] > 0:
+            percOACorr[i] = round(float(100 * pubOACorr[i])/float(pubOA[i]), 1)
+        else:
+            percOACorr[i] = 0
+        if pubAll[i] > 0:
+            percHybrid[i] = round(float(100 * pubHybrid[i])/float(pubAll[i]), 1)
+            percGreen[i] = round(float(100 * pubGreen[i])/float(pubAll[i]), 1)
+        else:
+            percHybrid[i] = 0
+            percGreen[i] = 0
+        if pubAll[i] > 0:
+            i1 = str(pubOA[i]) + ' ~ ' +\
+                 str(percOA[i]) + ' %'
+            i3 = str(pubHybrid[i]) + ' ~ ' +\
+                 str(percHybrid[i]) + ' %'
+            i4 = str(pubGreen[i]) + ' ~ ' +\
+                 str(percGreen[i]) + ' %'
+        else:
+            i1 = pubOA[i]
+        if pubOA[i] > 0:
+            i2 = str(pubOACorr[i]) + ' ~ ' +\
+                 str(percOACorr[i]) + ' %'
+        else:
+            i2 = pubOACorr[i]
+        ta.add_row([years[i], pubAll[i], i1, i3, i4, i2])
+    ta.add_row(['----', '----', '----', '----', '----', '----'])
+    years.append('Sum')
+    pubAll.append(sum(pubAll))
+    pubOA.append(sum(pubOA))
+    pubHybrid.append(sum(pubHybrid))
+    pubGreen.append(sum(pubGreen))
+    pubOACorr.append(sum(pubOACorr))
+    percOACorr.append(round(float(100 * sum(pubOACorr))/float(sum(pubOA)), 1))
+    percOA.append(round(float(100 * sum(pubOA))/float(sum(pubAll)), 1))
+    percHybrid.append(round(float(100 * sum(pubHybrid))/float(sum(pubAll)), 1))
+    percGreen.append(round(float(100 * sum(pubGreen))/float(sum(pubAll)), 1))
+
+    # Save results to file
+    ch = 'year\tNo. Publications\tNo. OA Publications\t% OA Publications\t\
+    No. Hybrid Publications\t% Hybrid Publications\tNo. Green Publications\t\
+    % Green Publications\tNo. OA Publications + Corr. Author\t\
+    % OA Publications with Corr. Auth'
+    OAStats = [*itertools.zip_longest(
+        years, 
+        pubAll, 
+        pubOA, 
+        percOA, 
+        pubHybrid, 
+        percHybrid, 
+        pubGreen, 
+        percGreen, 
+        pubOACorr, 
+        percOACorr       
+    )]
+    
+    writeTsv('output-files/statistics_OA.txt', OAStats, ch)
+
+    # Add last line to table in console
+    v1 = str(pubOA[-1]) + ' ~ ' + str(percOA[-1]) + ' %'
+    v3 = str(pubHybrid[-1]) + ' ~ ' + str(percHybrid[-1]) + ' %'
+    v4 = str(pubGreen[-1]) + ' ~ ' + str(percGreen[-1]) + ' %'
+    if sum(pubOA) > 0:
+        v2 = str(pubOACorr[-1]) + ' ~ ' + str(percOACorr[-1]) + ' %'
+    else:
+        v2 = sum(pubOACorr)
+    ta.add_row(['Sum', pubAll[-1], v1, v3, v4, v2])
+    print(ta)
+    print('Percentages for Gold OA and hybrid and green publications refer \
+to the overall number of articles. The percentage for OA publications \
+with a corresponding author from a relevant institution refer to the \
+number of gold OA publications. ', str(len(finalList) - pubAll[-1]), \
+    'publications were not included in this table, because the data provided \
+by the database does not contain a year.')
+
+    # Do statistics for publishers of OA articles and save results to file
+    haeuf = goldPublishers(docTable)
+    pAN = float(sum(number for publisher, number in haeuf))
+    pN = len(haeuf)
+    print('Number of publishers: ', pN)
+    publisherStats = [None] * pN
+    tally = 0.
+    noPubl = ['x', 'UNKNOWN', 0, 0, 0]
+    tb = PrettyTable(['Rank', 'Publisher', '# Publications',
+                      '% of Publications', 'Cumulative % of Publications'])
+    counts = 0
+    for i in range(0, pN):
+        if haeuf[i][0] == '':
+            noPubl[2] += haeuf[i][1]
+        elif haeuf[i][0] is None:
+            noPubl[2] += haeuf[i][1]
+        else:
+            tally += haeuf[i][1]
+            publisherStats[i] = [counts + 1, haeuf[i][0], haeuf[i][1],
+                                 round(100. * haeuf[i][1]/pAN, 2),
+                                 round(100. * tally/pAN, 2)]
+            counts += 1
+            if counts < 21:
+                tb.add_row(publisherStats[i])
+    tally += noPubl[2]
+    noPubl[3] = round(100. * noPubl[2]/pAN, 2)
+    noPubl[4] = round(100. * tally/pAN, 2)
+    publisherStats.append(noPubl)
+    publisherStats = [item for item in publisherStats if item is not None]
+    ch = 'Rank\tPublisher\t# Publications\t% Publications\t\
+    Cumulative % of Publications'
+    writeTsv('output-files/statistics_goldPublishers.txt', publisherStats, ch)
+    print(tb)
+
+    # Do the statistics above for every institution (publications with an
+    # author from the institution; APCs for gold OA publications with a
+    # corresponding author from there) and save results to files
+    instStats = institutionStatistics(finalList, institutionNames)
+    instRows = []
+    instPublishers = []
+    tc = PrettyTable(['Institution', '# Publications', '# Gold', '# Hybrid',
+                      '# Green', '# Corr. Author', '# Gold + Corr. Author',
+                      'Estimated APCs (1481 €)'])
+    for inst in instStats:
+        if inst.pubAll > 0:
+            percs = [round(100. * x/inst.pubAll, 1) for x in
+                     (inst.pubGold, inst.pubHybrid, inst.pubGreen)]
+        else:
+            percs = [0, 0, 0]
+        APCs = '; '.join(str(inst.APCAmounts[curr]) + ' ' + str(curr)
+                         for curr in sorted(inst.APCAmounts, key=str))
+        instRows.append([inst.name, inst.pubAll, inst.pubGold, percs[0],
+                         inst.pubHybrid, percs[1], inst.pubGreen, percs[2],
+                         inst.pubCorr, inst.pubGoldCorr,
+                         inst.pubGoldCorr * 1481, inst.withAPC, APCs])
+        tc.add_row([inst.name, inst.pubAll,
+                    str(inst.pubGold) + ' ~ ' + str(percs[0]) + ' %',
+                    str(inst.pubHybrid) + ' ~ ' + str(percs[1]) + ' %',
+                    str(inst.pubGreen) + ' ~ ' + str(percs[2]) + ' %',
+                    inst.pubCorr, inst.pubGoldCorr,
+                    str(inst.pubGoldCorr * 1481) + ' €'])
+        instPublishers += [[inst.name] + row for row in publisherRanking(inst)]
+    ch = 'Institution\tNo. Publications\tNo. Gold\t% Gold\tNo. Hybrid\t' + \
+         '% Hybrid\tNo. Green\t% Green\tNo. Corr. Author\t' + \
+         'No. Gold + Corr. Author\tEstimated APCs (1481 €)\t' + \
+         'No. Gold + Corr. Author with APC in DOAJ\tAPCs in DOAJ'
+    writeTsv('output-files/statistics_institutions.txt', instRows, ch)
+    if instPublishers != []:
+        ch = 'Institution\tRank\tPublisher\t# Publications\t' + \
+             '% Publications\tCumulative % of Publications'
+        writeTsv('output-files/statistics_institutionPublishers.txt',
+                 instPublishers, ch)
+    print(tc)
+
+
+# Create all results (see above)
+# INPUT: (list of Documents, names of the institutions, doAnalysis (see
+#         section 1 of main.py), compression of allPubs.txt, RunReport or None)
+def writeResults(finalList, institutionNames, doAnalysis=True,
+                 compression=None, report=None):
+    if report is not None:
+        report.begin('outputs')
+    printResults(finalList, compression)
+    if report is not None:
+        report.end(records=len(finalList))
+        report.begin('statistics')
+    if doAnalysis:
+        printStatistics(finalList, institutionNames)
+    if report is not None:
+        report.end(records=len(finalList))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows - no memory data in the report
+    resource = None
+
+
+# Return the peak resident memory of the running process so far. This is the
+# high-water mark of the whole process, not of a single stage.
+# OUTPUT: peak RSS in MB or None if it can't be determined
+def peakRSS():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # macOS reports bytes, Linux kilobytes
+        rss /= 1024.
+    return round(rss / 1024., 1)
+
+
+# Return the resident memory the running process uses at the moment
+# OUTPUT: RSS in MB or None if it can't be determined (only available where
+#         there is /proc, e.g. Linux)
+def currentRSS():
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf('SC_PAGE_SIZE') / 1048576., 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+# Return the memory data of a stage
+# INPUT: RSS at the start of the stage (see currentRSS)
+# OUTPUT: (RSS at the start, RSS at the end, peak RSS of the process so far)
+def stageMemory(rssStart):
+    return (rssStart, currentRSS(), peakRSS())
+
+
+# Return the CPU time used so far by the running process and all of its
+# finished child processes (e.g. the processes reading in the database files)
+# OUTPUT: CPU time in seconds
+def cpuTime():
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+# Set up class for measuring the stages of a run (wall time, CPU time, memory
+# and record counts) and saving the results as a JSON run report. For every
+# stage the RSS at its start and end and the growth in between are saved;
+# processPeakRSS is the peak of the whole process up to the end of the stage,
+# so it is the same for all stages after the one using the most memory.
+# Stages are measured between begin() and end(); stages measured elsewhere
+# (e.g. in another process) are added via add().
+# settings: additional data saved with the report (e.g. the settings of
+# section 1 of main.py)
+class RunReport(object):
+    def __init__(self, **settings):
+        self.settings = settings
+        self.started = time.time()
+        self.startWall = time.perf_counter()
+        self.startCPU = cpuTime()
+        self.stages = []
+        self.current = None
+
+    # Start measuring a stage
+    # INPUT: name of the stage
+    def begin(self, name):
+        self.current = (name, time.perf_counter(), cpuTime(), currentRSS())
+
+    # Stop measuring the current stage
+    # INPUT: record counts or other numbers describing the stage as keyword
+    #        arguments
+    def end(self, **counts):
+        name, wall, cpu, rss = self.current
+        self.current = None
+        self.add(name, time.perf_counter() - wall, cpuTime() - cpu,
+                 stageMemory(rss), **counts)
+
+    # INPUT: (name of the stage, wall time, CPU time, memory in MB (see
+    #         stageMemory), record counts as keyword arguments)
+    def add(self, name, wall, cpu, memory, **counts):
+        rssStart, rssEnd, processPeak = memory
+        if rssStart is not None and rssEnd is not None:
+            growth = round(rssEnd - rssStart, 1)
+        else:
+            growth = None
+        self.stages.append({'stage': name,
+                            'wallTime': round(wall, 3),
+                            'cpuTime': round(cpu, 3),
+                            'rssStart': rssStart,
+                            'rssEnd': rssEnd,
+                            'rssGrowth': growth,
+                            'processPeakRSS': processPeak,
+                            'counts': counts})
+
+    # Save the report to a JSON file
+    # INPUT: file name
+    def write(self, filename):
+        report = {'started': time.strftime('%Y-%m-%dT%H:%M:%S',
+                                           time.localtime(self.started)),
+                  'wallTime': round(time.perf_counter() - self.startWall, 3),
+                  'cpuTime': round(cpuTime() - self.startCPU, 3),
+                  'peakRSS': peakRSS(),
+                  'settings': self.settings,
+                  'stages': self.stages}
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
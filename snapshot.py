@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from documents import Document
+
+# Snapshot files store a list of Documents column by column:
+# - 8 bytes magic number, 8 bytes length of the header
+# - header (JSON): number of documents, additional data (e.g. the fingerprint
+#   of the file the data comes from) and, for each attribute, position and
+#   length of its three arrays in the file
+# - per attribute: 'kinds' (one byte per document: type of the value),
+#   'offsets' (start of every value in the text, int64) and 'text' (all
+#   values as UTF-8 text, separated by NUL characters)
+# Every array starts at a multiple of 8 bytes, so the file can be memory-
+# mapped and a single attribute can be read without touching the others.
+magic = b'OAEVSNP1'
+
+# Types of values
+NONE, STR, INT, FALSE, TRUE, FLOAT = range(6)
+
+
+# Fingerprint of a file: size, time of last modification and SHA-1 hash. The
+# hash is only computed again if size or time differ from the old fingerprint.
+# Used to decide whether data derived from a file has to be created again.
+# INPUT: (file name, old fingerprint or None)
+# OUTPUT: fingerprint (dictionary)
+def fileFingerprint(fileName, old=None):
+    stat = os.stat(fileName)
+    new = {'size': stat.st_size, 'mtime': stat.st_mtime}
+    if old is not None and old['size'] == new['size'] \
+    and old['mtime'] == new['mtime']:
+        new['sha1'] = old['sha1']
+    else:
+        sha1 = hashlib.sha1()
+        with open(fileName, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(block)
+        new['sha1'] = sha1.hexdigest()
+    return new
+
+
+# Write a list of Documents (or other objects with the given attributes) to a
+# snapshot file
+# INPUT: (list of Documents, file name, attributes to be saved (default: all
+#         attributes of a Document), additional data for the header)
+def writeSnapshot(docList, filename, fields=None, meta=None):
+    if fields is None:
+        fields = Document.__slots__
+    header = {'count': len(docList), 'fields': {}, 'meta': meta or {}}
+    arrays = []
+    position = 0
+    for field in fields:
+        kinds = np.zeros(len(docList), dtype=np.uint8)
+        texts = [''] * len(docList)
+        for i, doc in enumerate(docList):
+            value = getattr(doc, field)
+            if value is None:
+                continue
+            elif value is True:
+                kinds[i] = TRUE
+            elif value is False:
+                kinds[i] = FALSE
+            elif isinstance(value, int):
+                kinds[i] = INT
+                texts[i] = str(value)
+            elif isinstance(value, float):
+                kinds[i] = FLOAT
+                texts[i] = repr(value)
+            else:
+                kinds[i] = STR
+                texts[i] = str(value)
+        lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64,
+                              count=len(texts))
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        text = '\x00'.join(texts).encode('utf-8')
+        header['fields'][field] = {}
+        for name, data in (('kinds', kinds.tobytes()),
+                           ('offsets', offsets.tobytes()), ('text', text)):
+            header['fields'][field][name] = [position, len(data)]
+            arrays.append(data)
+            position += len(data) + (-len(data) % 8)
+    header = json.dumps(header).encode('utf-8')
+    header += b' ' * (-len(header) % 8)
+    # Write to a temporary file first, so that other processes never read a
+    # half-written snapshot
+    with open(filename + '.tmp', 'wb') as f:
+        f.write(magic + struct.pack('<Q', len(header)) + header)
+        for data in arrays:
+            f.write(data + b'\x00' * (-len(data) % 8))
+    os.replace(filename + '.tmp', filename)
+
+
+# Set up class for reading a snapshot file. The file is memory-mapped; the
+# values of an attribute are only decoded when they are requested.
+class Snapshot(object):
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[0:8] != magic:
+            raise ValueError(filename + ' is not a snapshot file')
+        length = struct.unpack('<Q', self.map[8:16])[0]
+        header = json.loads(self.map[16:16 + length].decode('utf-8'))
+        self.start = 16 + length
+        self.count = header['count']
+        self.fields = header['fields']
+        self.meta = header.get('meta', {})
+
+    def __len__(self):
+        return self.count
+
+    def array(self, field, name):
+        position, length = self.fields[field][name]
+        return self.map[self.start + position:self.start + position + length]
+
+    # Return the values of one attribute for all documents
+    # INPUT: name of the attribute
+    # OUTPUT: list of values
+    def column(self, field):
+        kinds = np.frombuffer(self.array(field, 'kinds'), dtype=np.uint8)
+        if not (kinds != NONE).any():
+            return [None] * self.count
+        text = self.array(field, 'text').decode('utf-8')
+        values = text.split('\x00')
+        if len(values) != self.count:
+            # a value contains a NUL character itself
+            offsets = np.frombuffer(self.array(field, 'offsets'),
+                                    dtype=np.int64).tolist()
+            values = [text[offsets[i]:offsets[i + 1] - 1]
+                      for i in range(self.count)]
+        for i in np.flatnonzero(kinds == NONE).tolist():
+            values[i] = None
+        for i in np.flatnonzero(kinds > STR).tolist():
+            kind = int(kinds[i])
+            if kind == INT:
+                values[i] = int(values[i])
+            elif kind == FLOAT:
+                values[i] = float(values[i])
+            else:
+                values[i] = kind == TRUE
+        return values
+
+    # Create Documents from the snapshot. Attributes that are not requested
+    # (or not stored in the snapshot) keep their default values.
+    # INPUT: attributes to be read (default: all stored attributes)
+    # OUTPUT: list of Documents
+    def documents(self, fields=None):
+        if fields is None:
+            fields = list(self.fields)
+        default = Document('', '', None, None, None, None, None, None, '',
+                           None, None, None, None, None)
+        new = Document.__new__
+        docList = [new(Document) for i in range(self.count)]
+        for field in Document.__slots__:
+            setField = Document.__dict__[field].__set__
+            if field in fields and field in self.fields:
+                for doc, value in zip(docList, self.column(field)):
+                    setField(doc, value)
+            else:
+                value = getattr(default, field)
+                for doc in docList:
+                    setField(doc, value)
+        return docList
+
+    def close(self):
+        self.map.close()
+        self.file.close()
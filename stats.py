@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import collections
+
+import numpy as np
+
+# Codes of the OA status used in the statistics (0 = no OA status)
+oaCodes = {'gold': 1, 'hybrid': 2, 'green': 3}
+
+
+# Number the distinct values of a list in the order of their first occurrence
+# INPUT: list of values
+# OUTPUT: (numpy array with the number of every value, list of the distinct
+#         values)
+def encode(values):
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index))
+                         for value in values), dtype=np.intp,
+                        count=len(values))
+    return codes, list(index)
+
+
+# Set up class holding attributes of a list of Documents as numpy arrays of
+# codes (see encode). Every attribute is encoded once when it is first
+# needed; afterwards all counts are done with numpy (bincount) instead of
+# loops over the documents.
+class DocTable(object):
+    def __init__(self, docList):
+        self.docList = docList
+        self.count = len(docList)
+        self.columns = {}
+        self.status = np.fromiter((oaCodes.get(doc.oaStatus, 0)
+                                   for doc in docList), dtype=np.intp,
+                                  count=self.count)
+        self.corrAuth = np.fromiter((doc.nameVariant is not None
+                                     for doc in docList), dtype=bool,
+                                    count=self.count)
+
+    # INPUT: name of the attribute
+    # OUTPUT: (array of codes, list of distinct values)
+    def codes(self, field):
+        if field not in self.columns:
+            self.columns[field] = encode([getattr(doc, field)
+                                          for doc in self.docList])
+        return self.columns[field]
+
+    # Count the documents per value of an attribute and OA status, e.g. per
+    # year, database (dbID) or licence
+    # INPUT: (name of the attribute, function applied to the values (e.g. int
+    #         for years) or None, boolean array selecting the documents to be
+    #         counted or None)
+    # OUTPUT: (list of values (sorted if possible), array with one row per
+    #         value and one column per OA status code)
+    def breakdown(self, field, key=None, mask=None):
+        codes, labels = self.codes(field)
+        status = self.status
+        if mask is not None:
+            codes = codes[mask]
+            status = status[mask]
+        # only the values of the selected documents are used
+        present = np.flatnonzero(
+            np.bincount(codes, minlength=len(labels))).tolist()
+        if key is None:
+            keys = {i: labels[i] for i in present}
+        else:
+            keys = {i: key(labels[i]) for i in present}
+        values = list(dict.fromkeys(keys.values()))
+        try:
+            values.sort()
+        except TypeError:
+            pass
+        position = {value: i for i, value in enumerate(values)}
+        rows = np.zeros(len(labels), dtype=np.intp)
+        for i, value in keys.items():
+            rows[i] = position[value]
+        counts = np.bincount(rows[codes] * 4 + status,
+                             minlength=len(values) * 4)
+        return values, counts.reshape(len(values), 4)
+
+
+# Count the publications of every year (see section 12 of main.py)
+# INPUT: DocTable
+# OUTPUT: (years, # publications, # gold, # hybrid, # green, # gold with a
+#         corresponding author from a relevant institution); lists with one
+#         entry per year
+def yearStatistics(table):
+    codes, labels = table.codes('year')
+    hasYear = np.array([label is not None for label in labels],
+                       dtype=bool)[codes]
+    years, counts = table.breakdown('year', int, hasYear)
+    goldCorr = hasYear & table.corrAuth & (table.status == oaCodes['gold'])
+    corrYears, corrCounts = table.breakdown('year', int, goldCorr)
+    pubOACorr = dict(zip(corrYears, corrCounts[:, oaCodes['gold']].tolist()))
+    return (years, counts.sum(axis=1).tolist(),
+            counts[:, oaCodes['gold']].tolist(),
+            counts[:, oaCodes['hybrid']].tolist(),
+            counts[:, oaCodes['green']].tolist(),
+            [pubOACorr.get(year, 0) for year in years])
+
+
+# Count the gold OA publications per publisher
+# INPUT: DocTable
+# OUTPUT: list of (publisher, # publications), most frequent first;
+#         publishers with the same number in the order of their first
+#         occurrence (same as collections.Counter.most_common)
+def goldPublishers(table):
+    codes, labels = table.codes('publisher')
+    gold = np.flatnonzero(table.status == oaCodes['gold'])
+    counts = np.bincount(codes[gold], minlength=len(labels))
+    first = np.full(len(labels), table.count, dtype=np.intp)
+    np.minimum.at(first, codes[gold], gold)
+    found = np.flatnonzero(counts)
+    order = found[np.lexsort((first[found], -counts[found]))]
+    return [(labels[i], int(counts[i])) for i in order]
+
+
+# Set up class for the figures of one institution. A publication counts for
+# an institution if one of its authors is from there (allNameVariants or
+# nameVariant); 'corrAuth' figures only count publications whose
+# corresponding author is from there (nameVariant).
+class InstStats(object):
+    def __init__(self, name):
+        self.name = name
+        self.pubAll = 0
+        self.pubGold = 0
+        self.pubHybrid = 0
+        self.pubGreen = 0
+        self.pubCorr = 0
+        self.pubGoldCorr = 0
+        self.withAPC = 0
+        self.APCAmounts = collections.Counter()
+        self.publishers = collections.Counter()
+
+
+# Collect the statistics of all institutions in one pass over the documents
+# INPUT: (list of Documents, names of the institutions in the order of the
+#         results)
+# OUTPUT: list of InstStats. Names found in the documents that are not in
+#         the list (e.g. misspelled in docsChecked.txt) are added at the end.
+def institutionStatistics(docList, names):
+    stats = collections.OrderedDict((name, InstStats(name)) for name in names)
+    for doc in docList:
+        corr = set(doc.nameVariant.split('; ')) if doc.nameVariant else set()
+        found = set(doc.allNameVariants.split('; ')) \
+                if doc.allNameVariants else set()
+        for name in found | corr:
+            inst = stats.get(name)
+            if inst is None:
+                inst = stats[name] = InstStats(name)
+            inst.pubAll += 1
+            if doc.oaStatus == 'gold':
+                inst.pubGold += 1
+                inst.publishers[doc.publisher] += 1
+            elif doc.oaStatus == 'hybrid':
+                inst.pubHybrid += 1
+            elif doc.oaStatus == 'green':
+                inst.pubGreen += 1
+        for name in corr:
+            inst = stats[name]
+            inst.pubCorr += 1
+            if doc.oaStatus == 'gold':
+                inst.pubGoldCorr += 1
+                if doc.APCValue is not None:
+                    inst.withAPC += 1
+                    inst.APCAmounts[doc.APCCurrency] += int(doc.APCValue)
+    return list(stats.values())
+
+
+# Rank the publishers of the gold OA publications of an institution (same
+# format as statistics_goldPublishers.txt; publications without publisher
+# are counted as 'UNKNOWN' at the end)
+# INPUT: InstStats
+# OUTPUT: list of [rank, publisher, # publications, %, cumulative %]
+def publisherRanking(inst):
+    total = float(sum(inst.publishers.values()))
+    ranking = []
+    tally = 0.
+    unknown = 0
+    for publisher, number in inst.publishers.most_common():
+        if publisher in ('', None):
+            unknown += number
+            continue
+        tally += number
+        ranking.append([len(ranking) + 1, publisher, number,
+                        round(100. * number/total, 2),
+                        round(100. * tally/total, 2)])
+    if unknown:
+        tally += unknown
+        ranking.append(['x', 'UNKNOWN', unknown,
+                        round(100. * unknown/total, 2),
+                        round(100. * tally/total, 2)])
+    return ranking
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Tests of the DOAJ index (doaj.py). Run from the main folder of the
+# repository with 'python -m unittest discover tests'.
+
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from doaj import DoajIndex, DoajJournal
+from issn import IssnLinking
+
+
+def journal(issn, eissn, title):
+    return DoajJournal(issn, eissn, title, 'subject', '', '', 'publisher',
+                       'CC BY', 2000)
+
+
+class Doc(object):
+    def __init__(self, issn, eissn):
+        self.ISSN = issn
+        self.eISSN = eissn
+
+
+# ISSN-L table: 2049-3630 (eISSN) and 0378-5955 (print) share the ISSN-L
+# 0378-5955 (the numbers are the first seven digits)
+linking = IssnLinking(np.array([378595, 2049363], dtype=np.int64),
+                      np.array([378595, 378595], dtype=np.int64))
+
+
+class DoajIndexTest(unittest.TestCase):
+    def test_lookup_normalizes_issns(self):
+        index = DoajIndex([journal('ISSN 03785955', '', 'A')])
+        self.assertEqual(index.lookup('0378-5955').title, 'A')
+        self.assertIsNone(index.lookup('2049-3630'))
+
+    def test_malformed_issn_is_kept(self):
+        index = DoajIndex([journal('n/a', '-', 'A')])
+        self.assertEqual(index.lookup('n/a').title, 'A')
+        self.assertEqual(index.keys(), [['n/a'], ['-']])
+
+    # Regression: ISSNs that can't be normalized made setLinking fail with a
+    # ValueError
+    def test_set_linking_with_malformed_issn(self):
+        index = DoajIndex([journal('n/a', '-', 'A'),
+                           journal('free text', '', 'B'),
+                           journal('', '2049-3630', 'C')])
+        index.setLinking(linking)
+        self.assertEqual(list(index.byLink), ['0378-5955'])
+
+    def test_lookup_docs_via_issn_l(self):
+        index = DoajIndex([journal('', '2049-3630', 'C')])
+        index.setLinking(linking)
+        journals, viaLink = index.lookupDocs([Doc('0378-5955', None),
+                                              Doc('2049-3630', None),
+                                              Doc('n/a', None),
+                                              Doc(None, None)])
+        self.assertEqual([x.title if x else None for x in journals],
+                         ['C', 'C', None, None])
+        self.assertEqual(viaLink, [True, False, False, False])
+
+
+if __name__ == '__main__':
+    unittest.main()
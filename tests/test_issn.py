@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Tests of the ISSN normalization and the ISSN-L table (issn.py). Run from the
+# main folder of the repository with 'python -m unittest discover tests'.
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import issn
+from issn import (IssnLinking, loadIssnLinking, normalizeDocISSNs,
+                  normalizeISSN, normalizeISSNs, readIssnLinking)
+
+
+class Doc(object):
+    def __init__(self, issn, eissn):
+        self.ISSN = issn
+        self.eISSN = eissn
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_valid_forms(self):
+        self.assertEqual(normalizeISSNs(['0378-5955', '03785955',
+                                         'ISSN 0378 5955', '1050-124x',
+                                         '1050-124X (Electronic)']),
+                         ['0378-5955', '0378-5955', '0378-5955', '1050-124X',
+                          '1050-124X'])
+
+    def test_invalid_check_digit(self):
+        # kept unless strict, so typos shared with the DOAJ still match
+        self.assertEqual(normalizeISSN('03785954'), '0378-5954')
+        self.assertIsNone(normalizeISSN('03785954', strict=True))
+        self.assertEqual(normalizeISSN('0378-5955', strict=True), '0378-5955')
+
+    def test_valid_issn_wins(self):
+        self.assertEqual(normalizeISSN('0378-5954, 2049-3630'), '2049-3630')
+        self.assertEqual(normalizeISSN('2049-3630; 0378-5955'), '2049-3630')
+        self.assertEqual(normalizeISSN('0378-5954, 1234-5678'), '0378-5954')
+
+    def test_empty_values(self):
+        self.assertEqual(normalizeISSNs(['', None]), [None, None])
+        self.assertEqual(normalizeISSNs([]), [])
+
+    def test_no_issn(self):
+        self.assertEqual(normalizeISSNs(['n/a', '-', 'free text', '1234-567',
+                                         '9780123456789']),
+                         [None] * 5)
+
+    def test_repeated_values(self):
+        self.assertEqual(normalizeISSNs(['03785955', 'n/a', '03785955']),
+                         ['0378-5955', None, '0378-5955'])
+
+    def test_documents(self):
+        docs = [Doc('03785955', 'ISSN 2049-3630'), Doc('', None),
+                Doc('n/a', '0378-5954')]
+        normalizeDocISSNs(docs)
+        self.assertEqual([(x.ISSN, x.eISSN) for x in docs],
+                         [('0378-5955', '2049-3630'), ('', None),
+                          ('n/a', '0378-5954')])
+
+
+# ISSN-L table: 2049-3630 and 0378-5955 share the ISSN-L 0378-5955
+table = 'ISSN\tISSN-L\n0378-5955\t0378-5955\n2049-3630\t0378-5955\n' \
+        'n/a\t0378-5955\n'
+
+
+class LinkingTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.tableFile = os.path.join(self.folder, 'ISSN-to-ISSN-L.txt')
+        self.indexFile = os.path.join(self.folder, 'issnl.npz')
+        with open(self.tableFile, 'w', encoding='utf-8') as f:
+            f.write(table)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_read(self):
+        linking = readIssnLinking(self.tableFile)
+        self.assertEqual(len(linking), 2)
+        self.assertEqual(linking.linkAll(['2049-3630', '0378-5955',
+                                          '1050-124X', None]),
+                         ['0378-5955', '0378-5955', None, None])
+        self.assertEqual(linking.link('2049-3630'), '0378-5955')
+
+    def test_malformed_values(self):
+        linking = readIssnLinking(self.tableFile)
+        self.assertEqual(linking.linkAll(['n/a', '', '20493630',
+                                          '2049-3630']),
+                         [None, None, None, '0378-5955'])
+
+    def test_empty_table(self):
+        linking = IssnLinking(np.zeros(0, dtype=np.int64),
+                              np.zeros(0, dtype=np.int64))
+        self.assertEqual(linking.linkAll(['2049-3630', None]), [None, None])
+
+    def test_cache_reuse(self):
+        linking = loadIssnLinking(self.tableFile, self.indexFile)
+        self.assertTrue(os.path.exists(self.indexFile))
+        self.assertEqual(linking.link('2049-3630'), '0378-5955')
+        # unchanged table: loaded from the numpy file
+        with mock.patch.object(issn, 'readIssnLinking',
+                               side_effect=AssertionError('read again')):
+            linking = loadIssnLinking(self.tableFile, self.indexFile)
+        self.assertEqual(linking.link('2049-3630'), '0378-5955')
+
+    def test_cache_invalidation(self):
+        loadIssnLinking(self.tableFile, self.indexFile)
+        with open(self.tableFile, 'w', encoding='utf-8') as f:
+            f.write('ISSN\tISSN-L\n2049-3630\t2049-3630\n')
+        linking = loadIssnLinking(self.tableFile, self.indexFile)
+        self.assertEqual(linking.linkAll(['2049-3630', '0378-5955']),
+                         ['2049-3630', None])
+        # the numpy file was replaced
+        with mock.patch.object(issn, 'readIssnLinking',
+                               side_effect=AssertionError('read again')):
+            linking = loadIssnLinking(self.tableFile, self.indexFile)
+        self.assertEqual(linking.link('2049-3630'), '2049-3630')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import gzip
+import io
+import os
+import re
+
+try:
+    import zstandard
+except ImportError:
+    # optional - only needed for compression = 'zstd'
+    zstandard = None
+
+# File name extensions of the compressed output files
+extensions = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+# Characters replaced by a space in unquoted values (see TsvWriter)
+cleanPattern = re.compile('[\t\n\r]')
+
+
+# Open a text file for writing, compressed with gzip or zstd if requested.
+# The extension of the compression is added to the file name.
+# INPUT: (file name, None | 'gzip' | 'zstd', size of the write buffer)
+# OUTPUT: file object
+def openOutput(filename, compression=None, bufferSize=1 << 20):
+    filename += extensions[compression]
+    if compression is None:
+        return open(filename, 'w', encoding='utf-8', buffering=bufferSize)
+    if compression == 'gzip':
+        # low compression level: the files are written much faster and are
+        # only slightly larger
+        raw = gzip.open(filename, 'wb', compresslevel=3)
+    elif zstandard is None:
+        raise ValueError('compression = "zstd" requires the package '
+                         'zstandard')
+    else:
+        raw = zstandard.ZstdCompressor().stream_writer(open(filename, 'wb'))
+    return io.TextIOWrapper(io.BufferedWriter(raw, bufferSize),
+                            encoding='utf-8')
+
+
+# Open a text file written by openOutput. Compressed files are found via
+# their extension.
+# INPUT: file name without the extension of the compression
+# OUTPUT: file object
+def openInput(filename):
+    if not filename.endswith(('.gz', '.zst')):
+        for extension in ('.gz', '.zst'):
+            if os.path.exists(filename + extension):
+                return openInput(filename + extension)
+        return open(filename, encoding='utf-8')
+    if filename.endswith('.gz'):
+        return gzip.open(filename, 'rt', encoding='utf-8')
+    if zstandard is None:
+        raise ValueError(filename + ': reading zstd files requires the '
+                         'package zstandard')
+    return io.TextIOWrapper(
+        zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb')),
+        encoding='utf-8')
+
+
+# Set up class for writing tab-separated output files row by row. Rows are
+# collected and written in large blocks.
+# quoted = True: every value is written as "value" (format of the files
+#     formerly written with numpy.savetxt(..., fmt='"%s"'))
+# quoted = False: None is written as 'None', values are stripped and tabs
+#     and line breaks in values are replaced by spaces (format of allPubs.txt)
+# A row that is not a list or tuple is written as a row with one value.
+class TsvWriter(object):
+    def __init__(self, filename, header=None, quoted=True, compression=None,
+                 blockSize=10000):
+        self.file = openOutput(filename, compression)
+        self.quoted = quoted
+        self.blockSize = blockSize
+        self.lines = []
+        if header is not None:
+            self.file.write(header + '\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def writerow(self, row):
+        if not isinstance(row, (list, tuple)):
+            row = (row,)
+        if self.quoted:
+            line = '"' + '"\t"'.join([str(x) for x in row]) + '"\n'
+        else:
+            values = ['None' if x is None else str(x).strip() for x in row]
+            line = '\t'.join(values)
+            # most rows contain no tabs or line breaks in their values and
+            # can be written without replacing anything
+            if line.count('\t') >= len(values) or '\n' in line or \
+                    '\r' in line:
+                line = '\t'.join([cleanPattern.sub(' ', x) for x in values])
+            line += '\n'
+        self.lines.append(line)
+        if len(self.lines) >= self.blockSize:
+            self.flush()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def flush(self):
+        self.file.write(''.join(self.lines))
+        self.lines = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+# Write a whole table to a tab-separated file (see TsvWriter)
+# INPUT: (file name, rows, header line or None, quoted, compression)
+def writeTsv(filename, rows, header=None, quoted=True, compression=None):
+    with TsvWriter(filename, header, quoted, compression) as writer:
+        writer.writerows(rows)
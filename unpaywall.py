@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+# Local index of an Unpaywall data snapshot (gzip-compressed JSON lines, one
+# record per DOI, see https://unpaywall.org/products/snapshot). Only the
+# fields used by askOaDOI in main.py are kept, in an SQLite file with the
+# normalized DOI as key. With contactOaDOI = 3 (see section 1 of main.py) the
+# DOIs are looked up there and only DOIs missing in the snapshot are sent to
+# the Unpaywall-API.
+#
+# Usage (import once, takes a while for a full snapshot):
+#   python unpaywall.py unpaywall_snapshot.jsonl.gz unpaywall-index.sqlite
+# Several files (e.g. a snapshot and later changefiles) can be given; records
+# of later files replace those of earlier ones.
+
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import time
+
+from webapi import normalizeDOI
+
+# Number of records inserted at once during the import
+batchSize = 50000
+
+# Number of DOIs looked up with one query
+lookupSize = 500
+
+
+# Extract the fields used by askOaDOI from a record of the snapshot
+# INPUT: decoded JSON record
+# OUTPUT: (normalized DOI, is_oa, journal_is_oa, host_type, license,
+#         publisher); host_type and license of the best OA location, None if
+#         there is no OA location
+def snapshotRow(data):
+    location = data.get('best_oa_location') or {}
+    return (normalizeDOI(data['doi']), data.get('is_oa'),
+            data.get('journal_is_oa'), location.get('host_type'),
+            location.get('license'), data.get('publisher'))
+
+
+# Stream Unpaywall snapshot files into an index file. The index is written to
+# a temporary file first and replaces an existing index at the end.
+# INPUT: (list of snapshot file names (.jsonl.gz or .jsonl), file name of the
+#         index)
+# OUTPUT: number of records in the index
+def importSnapshot(snapshotFiles, indexFile):
+    if os.path.exists(indexFile + '.tmp'):
+        os.remove(indexFile + '.tmp')
+    connection = sqlite3.connect(indexFile + '.tmp')
+    # the file is thrown away if the import fails, so no journal is needed
+    connection.execute('PRAGMA journal_mode = OFF')
+    connection.execute('PRAGMA synchronous = OFF')
+    connection.execute(
+        'CREATE TABLE unpaywall (doi TEXT PRIMARY KEY, is_oa INTEGER, '
+        'journal_is_oa INTEGER, host_type TEXT, license TEXT, '
+        'publisher TEXT) WITHOUT ROWID')
+    connection.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)')
+    insert = 'INSERT OR REPLACE INTO unpaywall VALUES (?, ?, ?, ?, ?, ?)'
+    start = time.perf_counter()
+    count = 0
+    for fileName in snapshotFiles:
+        print('Import ' + fileName)
+        if fileName.endswith('.gz'):
+            f = gzip.open(fileName, 'rt', encoding='utf-8')
+        else:
+            f = open(fileName, encoding='utf-8')
+        with f:
+            rows = []
+            for line in f:
+                if not line.strip():
+                    continue
+                rows.append(snapshotRow(json.loads(line)))
+                if len(rows) >= batchSize:
+                    connection.executemany(insert, rows)
+                    count += len(rows)
+                    rows = []
+                    if count % (20 * batchSize) == 0:
+                        print('Imported %d records (%.0f per second)'
+                              % (count, count/(time.perf_counter() - start)))
+            connection.executemany(insert, rows)
+            count += len(rows)
+    total = connection.execute('SELECT COUNT(*) FROM unpaywall').fetchone()[0]
+    connection.executemany('INSERT INTO meta VALUES (?, ?)', [
+        ('sources', json.dumps([os.path.basename(x) for x in snapshotFiles])),
+        ('created', time.strftime('%Y-%m-%d %H:%M:%S')),
+        ('records', str(total))])
+    connection.commit()
+    connection.close()
+    os.replace(indexFile + '.tmp', indexFile)
+    return total
+
+
+# Set up class for looking up DOIs in an index created by importSnapshot
+class UnpaywallIndex(object):
+    def __init__(self, filename):
+        if not os.path.exists(filename):
+            raise FileNotFoundError(filename + ' not found - import an '
+                                    'Unpaywall snapshot first (see '
+                                    'unpaywall.py)')
+        self.connection = sqlite3.connect('file:' + filename + '?mode=ro',
+                                          uri=True)
+
+    # Look up several DOIs
+    # INPUT: list of DOIs
+    # OUTPUT: dictionary DOI (as given) -> answer in the format of the
+    #         Unpaywall-API (only the fields used by askOaDOI); DOIs missing
+    #         in the snapshot are left out
+    def lookupAll(self, dois):
+        keys = {}
+        for doi in dois:
+            keys.setdefault(normalizeDOI(doi), []).append(doi)
+        found = {}
+        keyList = list(keys)
+        for i in range(0, len(keyList), lookupSize):
+            part = keyList[i:i + lookupSize]
+            rows = self.connection.execute(
+                'SELECT * FROM unpaywall WHERE doi IN (%s)'
+                % ', '.join('?' * len(part)), part)
+            for key, isOA, journalIsOA, hostType, lizenz, publisher in rows:
+                if hostType is None:
+                    location = None
+                else:
+                    location = {'host_type': hostType, 'license': lizenz}
+                response = {'is_oa': None if isOA is None else bool(isOA),
+                            'journal_is_oa': None if journalIsOA is None
+                                             else bool(journalIsOA),
+                            'publisher': publisher,
+                            'best_oa_location': location}
+                for doi in keys[key]:
+                    found[doi] = response
+        return found
+
+    def close(self):
+        self.connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Import an Unpaywall data snapshot into a local index')
+    parser.add_argument('snapshot', nargs='+',
+                        help='snapshot file(s) (.jsonl.gz or .jsonl)')
+    parser.add_argument('index', help='file name of the index, e.g. '
+                                      'unpaywall-index.sqlite')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    total = importSnapshot(args.snapshot, args.index)
+    print('Saved %d records to %s in %.0f s'
+          % (total, args.index, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+###############################################################################
+# This work is distributed under a BSD 3-Clause License.
+# license terms see https://opensource.org/licenses/BSD-3-Clause
+# maintained by the Open Access team of TU Berlin University Library
+###############################################################################
+
+import concurrent.futures
+import json
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# HTTP status codes after which a request is sent again
+retryCodes = (429, 500, 502, 503, 504)
+
+# Stored answer for a DOI the API does not know (HTTP error 404)
+notFound = 'not found'
+
+
+# Normalize a DOI so that it can be used as a key (lower case, without
+# resolver prefix)
+# INPUT: DOI (string)
+# OUTPUT: normalized DOI (string)
+def normalizeDOI(doi):
+    doi = doi.strip().lower()
+    for prefix in ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/',
+                   'http://dx.doi.org/', 'doi:'):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi.strip()
+
+
+# Set up class for storing API answers in a local SQLite file. Answers are
+# stored per API and normalized DOI together with the time they were fetched.
+# DOIs the API does not know are stored as well (without an answer), so they
+# are not requested again before they expire.
+# maxAge: number of days after which a stored answer is fetched again
+#         (None = stored answers never expire)
+class ResponseCache(object):
+    def __init__(self, filename, maxAge=None):
+        self.maxAge = maxAge
+        self.connection = sqlite3.connect(filename)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses (api TEXT, doi TEXT, '
+            'fetched REAL, body TEXT, PRIMARY KEY (api, doi))')
+
+    # Return the stored answer, notFound for a stored 404 or None if there is
+    # nothing stored or it is too old
+    def get(self, api, doi):
+        row = self.connection.execute(
+            'SELECT fetched, body FROM responses WHERE api = ? AND doi = ?',
+            (api, normalizeDOI(doi))).fetchone()
+        if row is None:
+            return None
+        if self.maxAge is not None \
+        and time.time() - row[0] > self.maxAge * 86400:
+            return None
+        if row[1] is None:
+            return notFound
+        return json.loads(row[1])
+
+    # Store an answer; data = notFound stores a 404
+    def put(self, api, doi, data):
+        body = None if data is notFound else json.dumps(data)
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+            (api, normalizeDOI(doi), time.time(), body))
+
+    # Nothing is done if the cache is already closed (e.g. when a generator
+    # of ApiClient.fetchAll that was not used up is finished after close())
+    def commit(self):
+        if self.connection is not None:
+            self.connection.commit()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+
+# Set up class that limits the number of requests per second. The limiter is
+# shared by all worker threads of an ApiClient.
+class RateLimiter(object):
+    def __init__(self, rate):
+        self.interval = 1. / rate if rate else 0.
+        self.nextSlot = 0.
+        self.lock = threading.Lock()
+
+    # Block until the next request may be sent
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            slot = max(time.monotonic(), self.nextSlot)
+            self.nextSlot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+# Set up class for contacting a JSON-API (Unpaywall, CrossRef) with a
+# bounded number of parallel requests.
+# workers: number of requests sent in parallel (1 = one after the other)
+# rate: maximum number of requests per second (0/None = no limit)
+# retries: how often a request is repeated after an error 429/5xx, a timeout
+#          or a failed connection
+# backoff: seconds to wait before the first repetition; doubled every time
+# timeout: seconds to wait for an answer of the API
+# headers: additional HTTP headers sent with every request
+# cache: ResponseCache used to look up answers before contacting the API
+# api: name under which answers are stored in the cache
+class ApiClient(object):
+    def __init__(self, workers=1, rate=None, retries=3, backoff=1.,
+                 timeout=30, headers=None, cache=None, api=None):
+        self.workers = max(1, workers)
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.cache = cache
+        self.api = api
+        self.cacheHits = 0
+
+    # Send one request and return the decoded JSON answer. Errors that are
+    # not worth a repetition (e.g. 404) are raised at once; other errors are
+    # raised after the last repetition failed.
+    # INPUT: URL (string)
+    # OUTPUT: decoded JSON data
+    def getJSON(self, url):
+        attempt = 0
+        while True:
+            self.limiter.wait()
+            try:
+                request = urllib.request.Request(url, headers=self.headers)
+                with urllib.request.urlopen(request,
+                                            timeout=self.timeout) as response:
+                    return json.load(response)
+            except urllib.error.HTTPError as err:
+                if err.code not in retryCodes or attempt >= self.retries:
+                    raise
+                delay = self.retryDelay(attempt, err.headers.get('Retry-After'))
+            except (urllib.error.URLError, socket.timeout,
+                    ConnectionError):
+                if attempt >= self.retries:
+                    raise
+                delay = self.retryDelay(attempt, None)
+            time.sleep(delay)
+            attempt += 1
+
+    def retryDelay(self, attempt, retryAfter):
+        if retryAfter is not None and retryAfter.strip().isdigit():
+            return float(retryAfter)
+        return self.backoff * 2 ** attempt
+
+    # Request several URLs using up to 'workers' threads. If the client has a
+    # cache and keys (DOIs) are given, only URLs without a valid stored answer
+    # are requested and new answers (and 404 errors) are stored. For a stored
+    # 404 the HTTPError is yielded again without contacting the API.
+    # INPUT: list of URLs (strings), list of DOIs belonging to the URLs
+    # OUTPUT: generator yielding (JSON data, None) or (None, exception) for
+    #         each URL, in the order of the input list
+    def fetchAll(self, urls, keys=None):
+        def fetch(url):
+            try:
+                return (self.getJSON(url), None)
+            except Exception as err:
+                return (None, err)
+
+        if self.cache is None or keys is None:
+            cached = [None] * len(urls)
+        else:
+            cached = [self.cache.get(self.api, key) for key in keys]
+        missing = [url for url, data in zip(urls, cached) if data is None]
+        with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+            fetched = pool.map(fetch, missing)
+            try:
+                for i, data in enumerate(cached):
+                    if data is notFound:
+                        self.cacheHits += 1
+                        yield (None, urllib.error.HTTPError(
+                            urls[i], 404, 'Not Found (stored answer)', None,
+                            None))
+                        continue
+                    if data is not None:
+                        self.cacheHits += 1
+                        yield (data, None)
+                        continue
+                    result = next(fetched)
+                    if self.cache is not None and keys is not None:
+                        if result[1] is None:
+                            self.cache.put(self.api, keys[i], result[0])
+                        elif isinstance(result[1], urllib.error.HTTPError) \
+                        and result[1].code == 404:
+                            self.cache.put(self.api, keys[i], notFound)
+                        if i % 100 == 0:
+                            self.cache.commit()
+                    yield result
+            finally:
+                if self.cache is not None:
+                    self.cache.commit()